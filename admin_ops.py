@@ -0,0 +1,160 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+# --- [설정] 별칭(합쳐진 닉네임) 저장 파일 ---
+# 실행 위치와 상관없이 앱 폴더에 저장
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ALIAS_FILE = os.path.join(BASE_DIR, 'player_aliases.json')
+UNDO_LIMIT = 10
+
+
+# --- [함수] 별칭 로드/저장 ---
+def load_aliases(path=ALIAS_FILE):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_aliases(aliases, path=ALIAS_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(aliases, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def resolve_name(name, aliases):
+    # 별칭이 연쇄된 경우(스틴2 -> 스틴 -> 스티니)에도 최종 닉네임을 찾는다
+    seen = set()
+    while name in aliases and name not in seen:
+        seen.add(name)
+        name = aliases[name]
+    return name
+
+
+# --- [로직] 관리자 일괄 작업 (합치기 / 이름 변경 / 삭제) ---
+# 작업은 리스트로 쌓아두었다가 한 번에 적용한다. 하나라도 잘못되면 아무것도 바뀌지 않는다.
+#   {'op': 'merge',  'sources': ['스틴2'], 'target': '스틴'}
+#   {'op': 'rename', 'old': '스틴', 'new': '스티니'}
+#   {'op': 'delete', 'names': ['유령']}
+def describe_op(op):
+    if op['op'] == 'merge':
+        return f"🔗 {', '.join(op['sources'])} → {op['target']} (점수 합산)"
+    if op['op'] == 'rename':
+        return f"✏️ {op['old']} → {op['new']}"
+    if op['op'] == 'delete':
+        return f"❌ {', '.join(op['names'])} 삭제"
+    return str(op)
+
+
+def _score_map(df):
+    scores = {}
+    for name, score in zip(df['닉네임'], df['점수']):
+        scores[name] = scores.get(name, 0.0) + float(score)
+    return scores
+
+
+def apply_admin_ops(df, ops, aliases):
+    scores = _score_map(df)
+    new_aliases = dict(aliases)
+
+    for op in ops:
+        kind = op.get('op')
+        if kind == 'merge':
+            target = str(op['target']).strip()
+            # 같은 일괄 작업 안에서 앞서 이름이 바뀐 대표 닉네임은 바뀐 이름으로 따라간다
+            if target not in scores:
+                target = resolve_name(target, new_aliases)
+            if target not in scores:
+                raise ValueError(f"대표 닉네임이 없습니다 (앞선 작업에서 삭제됨?): {op['target']}")
+            sources = [s for s in dict.fromkeys(op['sources']) if s != target]
+            if not sources:
+                raise ValueError("합칠 닉네임과 대표 닉네임을 확인해주세요.")
+            missing = [s for s in sources if s not in scores]
+            if missing:
+                raise ValueError(f"존재하지 않는 닉네임: {', '.join(missing)}")
+            total = scores.pop(target, 0.0)
+            for source in sources:
+                total += scores.pop(source)
+                new_aliases[source] = target
+            scores[target] = total
+        elif kind == 'rename':
+            old, new = op['old'], str(op['new']).strip()
+            if old not in scores:
+                raise ValueError(f"존재하지 않는 닉네임: {old}")
+            if not new or new == old:
+                raise ValueError("새 닉네임을 입력해주세요.")
+            if new in scores:
+                raise ValueError(f"'{new}'은(는) 이미 있는 닉네임입니다. 합치기를 사용하세요.")
+            scores[new] = scores.pop(old)
+            new_aliases.pop(new, None)
+            new_aliases[old] = new
+        elif kind == 'delete':
+            missing = [n for n in op['names'] if n not in scores]
+            if missing:
+                raise ValueError(f"존재하지 않는 닉네임: {', '.join(missing)}")
+            for name in dict.fromkeys(op['names']):
+                scores.pop(name)
+                # 삭제한 닉네임을 가리키는 별칭도 지워야 옛 닉네임으로 입력했을 때 되살아나지 않는다
+                for alias in [a for a, t in new_aliases.items() if resolve_name(t, new_aliases) == name]:
+                    new_aliases.pop(alias)
+        else:
+            raise ValueError(f"알 수 없는 작업: {kind}")
+
+    # 별칭이 최종 닉네임을 가리키도록 정리 (자기 자신을 가리키는 별칭 제거)
+    new_aliases = {a: resolve_name(t, new_aliases) for a, t in new_aliases.items()}
+    new_aliases = {a: t for a, t in new_aliases.items() if a != t}
+
+    new_df = pd.DataFrame({'닉네임': list(scores.keys()), '점수': list(scores.values())})
+    return new_df, new_aliases
+
+
+# --- [로직] 되돌리기 기록 ---
+# 전체 순위표가 아니라 정리로 바뀐 부분(닉네임별 이전/이후 점수, 바뀐 별칭)만 남긴다.
+# 되돌릴 때는 현재 순위표에 역으로 적용하므로, 그사이 입력된 경기 점수는 지워지지 않는다.
+def make_undo_record(old_df, new_df, old_aliases, new_aliases, ops):
+    kst = timezone(timedelta(hours=9))
+    before, after = _score_map(old_df), _score_map(new_df)
+    names = list(dict.fromkeys(list(before) + list(after)))
+    alias_names = list(dict.fromkeys(list(old_aliases) + list(new_aliases)))
+    return {
+        'time': datetime.now(kst).strftime('%m/%d %H:%M:%S'),
+        'ops': [describe_op(op) for op in ops],
+        'deltas': [[n, before.get(n), after.get(n)] for n in names if before.get(n) != after.get(n)],
+        'aliases': [[a, old_aliases.get(a), new_aliases.get(a)] for a in alias_names
+                    if old_aliases.get(a) != new_aliases.get(a)],
+    }
+
+
+def push_undo(stack, record):
+    stack.append(record)
+    del stack[:-UNDO_LIMIT]
+    return stack
+
+
+def apply_undo(df, aliases, record):
+    scores = _score_map(df)
+    for name, before, after in record['deltas']:
+        score = scores.pop(name, 0.0) - (after or 0.0) + (before or 0.0)
+        # 정리로 새로 생긴 닉네임은 그사이 얻은 점수가 없을 때만 없앤다
+        if before is not None or abs(score) > 1e-9:
+            scores[name] = score
+
+    new_aliases = dict(aliases)
+    for alias, before, after in record['aliases']:
+        # 그사이 다른 정리로 바뀐 별칭은 건드리지 않는다
+        if new_aliases.get(alias) != after:
+            continue
+        if before is None:
+            new_aliases.pop(alias, None)
+        else:
+            new_aliases[alias] = before
+    new_aliases = {a: resolve_name(t, new_aliases) for a, t in new_aliases.items()}
+    new_aliases = {a: t for a, t in new_aliases.items() if a != t}
+
+    new_df = pd.DataFrame({'닉네임': list(scores.keys()), '점수': list(scores.values())})
+    return new_df, new_aliases
@@ -1,29 +1,33 @@
 import streamlit as st
 import pandas as pd
 import os
-import io
-from PIL import Image, ImageDraw, ImageFont
+import threading
 from datetime import datetime, timedelta, timezone
 import base64
-import gspread
-from google.oauth2.service_account import Credentials
-
-# --- [중요] 폰트 및 이미지 설정 ---
-FONT_FILE = 'malgunbd.ttf' 
-BG_IMAGE_FILE = 'bounty_bg.png' 
-SHEET_NAME = 'Holdem_Ranking' 
+from admin_ops import (load_aliases, save_aliases, resolve_name, describe_op,
+                       apply_admin_ops, make_undo_record, push_undo, apply_undo)
+from theme import BG_IMAGE_FILE, COLOR_TEXT_MAIN, COLOR_RED, COLOR_BROWN_BAR, COLOR_LIGHT_TEXT
+from fonts import preload_font_bytes, build_web_fonts, font_face_css, preload_links
+from poster import POSTER_COLUMNS, POSTER_FORMATS, MOVEMENT_COLUMN, RATING_COLUMN, load_background, render_poster_file
+from standings import RankTracker, format_movement, rank_standings, standings_version
+from exporter import EXPORT_FORMATS, ExportCache, available_formats, export_filename
+from sheet_watch import RANKING_RANGES, StandingsCache, SheetWatcher, parse_ranking_ranges
+from tv_feed import TV_TEMPLATE_FILE, TvFeed, render_tv_html
+from poster_jobs import PosterJobs
+from journal import ACTION_LABELS, Journal
+from rating import RatingEngine, game_places
+from scoring import apply_updates, score_game
+from sources import SHEET_NAME, get_current_month, sheet_client
+
+# --- [중요] 시트 설정 (배경 이미지/컬러는 theme.py, 폰트는 fonts.py) ---
 SHEET_URL = "https://docs.google.com/spreadsheets/d/1pR29ZbKQQIwgR6FyDt1VSU4v6DWjDzwI1bycfszzLlU/edit?gid=151586153#gid=151586153"
-# --- [설정] 디자인 컬러 팔레트 ---
-COLOR_TEXT_MAIN = "#3E2723" 
-COLOR_RED = "#B71C1C"       
-COLOR_GOLD = "#FFD700"      
-COLOR_BROWN_BAR = "#8D6E63" 
-COLOR_LIGHT_TEXT = "#EFEBE9" 
-
-# --- [시간] 한국 시간 월 구하기 ---
-def get_current_month():
-    kst = timezone(timedelta(hours=9))
-    return datetime.now(kst).month
+# --- [설정] 시트 외부 수정 감시 주기 (초, 0이면 매번 시트에서 직접 읽기) ---
+WATCH_INTERVAL_SEC = int(os.environ.get('WANTED_WATCH_INTERVAL', '20'))
+SESSION_CHECK_SEC = max(2, min(5, WATCH_INTERVAL_SEC))
+# --- [설정] TV(키오스크) 화면: ?view=tv ---
+TV_ROWS_PER_PAGE = 10
+TV_ROTATE_SEC = 12
+TV_POLL_SEC = 5
 
 CURRENT_MONTH = get_current_month()
 
@@ -35,17 +39,27 @@ def get_image_base64(image_path):
     except FileNotFoundError:
         return ""
 
-bg_base64 = get_image_base64(BG_IMAGE_FILE)
-
 # --- [디자인] Streamlit 웹 테마 ---
 st.set_page_config(page_title="ACE's Wanted List", page_icon="🤠", layout="wide")
-# --- [디자인] Streamlit 웹 테마 및 CSS 스타일 통합 ---
-st.markdown("""
-    <link href="https://fonts.googleapis.com/css2?family=Rye&family=Playfair+Display:wght@700&display=swap" rel="stylesheet">
-    """, unsafe_allow_html=True)
+TV_MODE = st.query_params.get("view") == "tv"
+
+# --- [디자인] CSS 스타일 통합 (프로세스당 한 번만 생성) ---
+# 글꼴 폴더의 폰트를 정적 파일로 서빙 (외부 Google Fonts 요청 없음)
+# 첫 화면은 서브셋이 없으면 원본 TTF로 그리고, 서브셋은 warm_up 스레드가 만든다.
+# 서브셋이 생기면 폰트 목록이 바뀌므로 CSS도 새 목록으로 한 번 더 만든다.
+def load_web_fonts():
+    try:
+        return build_web_fonts(subset=False)
+    except Exception:
+        return []
 
-st.markdown(f"""
+@st.cache_resource
+def build_page_css(web_fonts):
+    bg_base64 = get_image_base64(BG_IMAGE_FILE)
+    return preload_links(web_fonts) + f"""
     <style>
+    {font_face_css(web_fonts)}
+
     /* 1. 메인 화면 설정 */
     .stApp {{
         background-image: url("data:image/jpg;base64,{bg_base64}");
@@ -53,12 +67,12 @@ st.markdown(f"""
         background-repeat: no-repeat;
         background-attachment: fixed;
         color: {COLOR_TEXT_MAIN};
-        font-family: 'Playfair Display', serif;
+        font-family: 'Playfair Display', 'NanumSquareRound', serif;
     }}
     
     .main-title {{
         color: {COLOR_RED} !important;
-        font-family: 'Rye', cursive !important;
+        font-family: 'Rye', 'NanumSquareRound', cursive !important;
         text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
         text-transform: uppercase;
         font-size: 3rem;
@@ -127,7 +141,7 @@ st.markdown(f"""
         margin-bottom: 20px;
     }}
     th {{
-        font-family: 'Rye', cursive;
+        font-family: 'Rye', 'NanumSquareRound', cursive;
         font-size: 1.2rem;
         color: {COLOR_TEXT_MAIN};
         padding: 10px;
@@ -147,7 +161,7 @@ st.markdown(f"""
         vertical-align: middle;
         border-top: 2px solid {COLOR_TEXT_MAIN};
         border-bottom: 2px solid {COLOR_TEXT_MAIN};
-        font-family: 'Playfair Display', serif;
+        font-family: 'Playfair Display', 'NanumSquareRound', serif;
     }}
     tr.wanted-poster td:first-child {{ border-left: 2px solid {COLOR_TEXT_MAIN}; border-radius: 5px 0 0 5px; }}
     tr.wanted-poster td:last-child {{ border-right: 2px solid {COLOR_TEXT_MAIN}; border-radius: 0 5px 5px 0; }}
@@ -174,209 +188,239 @@ st.markdown(f"""
         }}
     }}
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+# TV 화면은 배경 이미지(1MB+) 없이 가벼운 CSS만 사용
+TV_PAGE_CSS = """
+    <style>
+    [data-testid="stSidebar"], [data-testid="stHeader"], [data-testid="stToolbar"], footer { display: none !important; }
+    .stApp { background: #F3E5C0; }
+    .block-container { padding: 0 !important; max-width: 100% !important; }
+    iframe { height: 100vh !important; border: none; }
+    </style>
+    """
+
+st.markdown(TV_PAGE_CSS if TV_MODE else build_page_css(load_web_fonts()), unsafe_allow_html=True)
+
+# --- [시작] 무거운 모듈/리소스는 백그라운드에서 미리 데워두기 (프로세스당 한 번) ---
+def warm_up():
+    try:
+        import PIL.ImageDraw  # noqa: F401
+        load_background(*POSTER_FORMATS['classic']['size'])
+        preload_font_bytes()
+        import gspread  # noqa: F401
+        from google.oauth2 import service_account  # noqa: F401
+    except Exception:
+        pass
+    # 웹 폰트 서브셋 (미리 만들어 두지 않은 경우에만 수 초 소요)
+    try:
+        build_web_fonts()
+    except Exception:
+        pass
+
+@st.cache_resource
+def start_warm_up():
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
 
 # --- [함수] 구글 시트 연결 및 데이터 로드/저장 ---
 @st.cache_resource
 def init_connection():
     try:
-        scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-        creds_dict = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        client = gspread.authorize(creds)
-        return client
+        return sheet_client(st.secrets["gcp_service_account"])
     except Exception as e:
         st.error(f"🔌 구글 연결 설정 오류: {e}")
         return None
 
+# --- [캐시] 프로세스 공용 순위표 + 시트 감시 스레드 ---
+@st.cache_resource
+def get_journal():
+    return Journal()
+
+@st.cache_resource
+def get_standings_cache():
+    # 순위표가 바뀔 때마다 (저장/시트 직접 수정 모두) 변경분이 저널에 남는다
+    cache = StandingsCache()
+    cache.subscribe(get_journal().on_standings_change)
+    return cache
+
+@st.cache_resource
+def start_sheet_watcher(_client):
+    # 세션이 몇 개든 시트는 이 스레드 하나만 주기적으로 확인한다
+    def fetch_ranges():
+        return _client.open(SHEET_NAME).sheet1.batch_get(RANKING_RANGES)
+    watcher = SheetWatcher(fetch_ranges, get_standings_cache(), WATCH_INTERVAL_SEC)
+    watcher.start()
+    return watcher
+
 # --- [함수] 데이터 로드 (6행~26행 사이의 데이터만 읽기) ---
 def load_data():
     client = init_connection()
     default_df = pd.DataFrame(columns=['닉네임', '점수'])
     if not client: return default_df
 
+    cache = get_standings_cache()
+    if WATCH_INTERVAL_SEC > 0:
+        start_sheet_watcher(client)
+        cached_df, version = cache.get()
+        if cached_df is not None:
+            st.session_state['seen_version'] = version
+            return cached_df
+
     try:
         sheet = client.open(SHEET_NAME).sheet1
         
         # [수정] 범위를 명확하게 '26행'까지로 제한
         # 27행 아래에 있는 데이터는 랭킹으로 인식하지 않기 위함입니다.
-        ranges = sheet.batch_get(['A6:C26', 'D6:F26'])
-        
-        left_data = ranges[0]  # 1~20등 위치
-        right_data = ranges[1] # 21~40등 위치
-        
-        all_data = left_data + right_data
-        
-        if not all_data: 
-            return default_df
-        
-        # 컬럼명 수동 지정
-        df = pd.DataFrame(all_data, columns=['순위', '닉네임', '점수'])
-        
-        df = df[['닉네임', '점수']]
-        df['닉네임'] = df['닉네임'].astype(str).str.strip()
-        df['점수'] = pd.to_numeric(df['점수'], errors='coerce').fillna(0)
-        
-        # 빈 값 제거
-        df = df[df['닉네임'] != ""]
+        read_gen = cache.write_generation()
+        ranges = sheet.batch_get(RANKING_RANGES)
+        df = parse_ranking_ranges(ranges)
         
+        version = standings_version(df)
+        cache.set(df, version, source='sheet', read_gen=read_gen)
+        st.session_state['seen_version'] = version
         return df
         
     except Exception as e:
         return default_df
 
 # --- [함수] 데이터 저장 (27행 밑으로는 건드리지 않음) ---
-def save_data(df):
+# 성공하면 True, 실패하면 오류를 표시하고 False (호출한 쪽은 성공했을 때만 다음 단계로)
+def save_data(df, action='editor', meta=None):
     client = init_connection()
-    if not client: return
+    if not client: return False
 
     try:
         sheet = client.open(SHEET_NAME).sheet1
         
         # 1. 정렬 및 순위 계산
-        df['점수'] = df['점수'].astype(float)
-        df_sorted = df.sort_values(by=['점수'], ascending=False).reset_index(drop=True)
-        df_sorted['순위'] = df_sorted['점수'].rank(method='min', ascending=False).astype(int)
-        
-        final_df = df_sorted[['순위', '닉네임', '점수']]
+        final_df = rank_standings(df)[['순위', '닉네임', '점수']]
         
         # 2. 데이터 분리
         df_left = final_df.iloc[0:20]   # 1~20등
         df_right = final_df.iloc[20:40] # 21~40등
         
-        # 3. [핵심 수정] 청소 범위를 '26행'까지로 고정
-        # 기존에는 F1000까지 지웠지만, 이제는 26행까지만 지웁니다.
-        sheet.batch_clear(['A6:C26', 'D6:F26'])
-        
-        # 4. 데이터 업데이트
-        if not df_left.empty:
-            sheet.update(range_name='A6', values=df_left.values.tolist())
+        # 3~5. 쓰는 동안에는 감시 스레드가 읽은 값(지워지거나 반쯤 쓰인 시트)을 버린다
+        cache = get_standings_cache()
+        with cache.writing():
+            # 3. [핵심 수정] 청소 범위를 '26행'까지로 고정
+            # 기존에는 F1000까지 지웠지만, 이제는 26행까지만 지웁니다.
+            sheet.batch_clear(RANKING_RANGES)
             
-        if not df_right.empty:
-            sheet.update(range_name='D6', values=df_right.values.tolist())
+            # 4. 데이터 업데이트
+            if not df_left.empty:
+                sheet.update(range_name='A6', values=df_left.values.tolist())
+                
+            if not df_right.empty:
+                sheet.update(range_name='D6', values=df_right.values.tolist())
+
+            # 5. 공용 캐시에도 바로 반영 (다른 세션은 다음 확인 때 새로고침)
+            saved_df = final_df.iloc[0:40][['닉네임', '점수']]
+            cache.set(saved_df, standings_version(saved_df), source=action, meta=meta)
+        return True
             
     except Exception as e:
         st.error(f"💾 저장 실패: {e}")
+        return False
 
-# --- [로직] 점수 규칙 ---
-SCORE_RULES = {
-    "3 FREE": {"normal": [7, 5, 3], "2chop": 7, "3chop": 6, "4chop": 5, "rebuy": 0.5},
-    "5 FREE": {"normal": [10, 7, 5], "2chop": 10, "3chop": 9, "4chop": 8, "rebuy": 1.0}
-}
-
-# --- [이미지 생성] 동점자 처리 적용 ---
-def create_ranking_image(df):
-    W, H = 1000, 1400
-    try:
-        image = Image.open(BG_IMAGE_FILE).resize((W, H))
-    except FileNotFoundError:
-        st.error(f"⚠️ 배경 이미지('{BG_IMAGE_FILE}')가 없습니다.")
-        return None
-    draw = ImageDraw.Draw(image)
+# --- [세션] 공용 캐시 버전이 바뀐 세션만 새로고침 (시트 호출 없음) ---
+@st.fragment(run_every=SESSION_CHECK_SEC)
+def watch_for_updates():
+    version = get_standings_cache().version
+    seen = st.session_state.get('seen_version')
+    if version is not None and seen is not None and version != seen:
+        st.rerun(scope="app")
 
-    try:
-        font_main = ImageFont.truetype(FONT_FILE, 30)
-        font_title_big = ImageFont.truetype(FONT_FILE, 100)
-        font_title_sub = ImageFont.truetype(FONT_FILE, 45)
-        font_nick = ImageFont.truetype(FONT_FILE, 32)
-        font_score = ImageFont.truetype(FONT_FILE, 28)
-        font_rank = ImageFont.truetype(FONT_FILE, 34) 
-    except IOError:
-        st.error(f"⚠️ 폰트 파일('{FONT_FILE}')이 없습니다.")
-        return None
-
-    draw.text((W/2, 80), "WANTED", font=font_title_big, fill=COLOR_RED, anchor="mm")
-    draw.text((W/2, 160), f"ACE's PUB - {CURRENT_MONTH}월 현상 수배자", font=font_title_sub, fill=COLOR_TEXT_MAIN, anchor="mm")
-    draw.line((100, 190, W-100, 190), fill=COLOR_TEXT_MAIN, width=5)
+# --- [캐시] 장부 내보내기 (프로세스 공용) ---
+@st.cache_resource
+def get_export_cache():
+    return ExportCache()
 
-    start_y = 230
-    col_widths = [60, 240, 100]
-    block_margin = 80
-    poster_height = 45
-    poster_gap = 10
+# --- [작업] 수배지 렌더링 풀 (프로세스 공용) ---
+@st.cache_resource
+def get_poster_jobs():
+    return PosterJobs()
+
+# 작업이 끝날 때까지만 1초마다 상태를 확인하고, 끝나면 화면 전체를 다시 그린다
+@st.fragment(run_every=1)
+def wait_for_poster(job_key):
+    job = get_poster_jobs().get(job_key)
+    if job is None or job.done():
+        st.rerun(scope="app")
+    st.info("📜 수배지 인쇄 중...")
+
+def show_poster_job(job_key):
+    job = get_poster_jobs().get(job_key)
+    if job is None:
+        return
+    if not job.done():
+        wait_for_poster(job_key)
+    elif job.exception() is not None:
+        st.error(f"⚠️ {job.exception()}")
+    else:
+        data, filename, mime = job.result()
+        st.download_button("📥 수배지 다운로드", data, filename, mime, use_container_width=True)
 
-    # 랭킹 계산 (동점자 처리)
-    df['점수'] = df['점수'].astype(float)
-    ranked_df = df.sort_values(by=['점수'], ascending=False).reset_index(drop=True)
-    ranked_df['순위'] = ranked_df['점수'].rank(method='min', ascending=False).astype(int)
-    ranked_df = ranked_df.head(40)
+# --- [순위 변동] 직전 저장 대비 ▲/▼/NEW (저널의 변경분만으로 갱신, 시트 추가 조회 없음) ---
+@st.cache_resource
+def get_rank_tracker():
+    journal = get_journal()
+    last_changes = journal.records[-1]['d'] if journal.records else ()
+    tracker = RankTracker(journal.state, last_changes)
+    journal.subscribe(tracker.on_record)
+    return tracker
+
+# --- [레이팅] 실력 레이팅 엔진 (프로세스 공용, 새 경기만 증분 반영) ---
+@st.cache_resource
+def get_rating_engine():
+    return RatingEngine()
 
-    total_table_width = (sum(col_widths) * 2) + block_margin
-    start_x = (W - total_table_width) / 2
+def attach_ratings(rank_df):
+    engine = get_rating_engine()
+    engine.sync(get_journal().records, load_aliases())
+    return engine.attach(rank_df)
 
-    current_x = start_x
-    for block_idx in range(2):
-        current_y = start_y
-        
-        headers = ["Rank", "Name", "Bounty"]
-        for i, h_text in enumerate(headers):
-            hx = current_x + sum(col_widths[:i]) + col_widths[i]/2
-            draw.text((hx, current_y), h_text, font=font_main, fill=COLOR_TEXT_MAIN, anchor="mm")
-        
-        current_y += 30
-        draw.line((current_x, current_y, current_x + sum(col_widths), current_y), fill=COLOR_TEXT_MAIN, width=3)
-        current_y += 20
-
-        start_rank_idx = block_idx * 20
-        end_rank_idx = start_rank_idx + 20
-        block_data = ranked_df.iloc[start_rank_idx:end_rank_idx]
-
-        for i in range(20):
-            if i < len(block_data):
-                row = block_data.iloc[i]
-                rank = row['순위'] # 실제 계산된 순위 사용
-                nick = row['닉네임']
-                score = f"${row['점수']:.1f}"
-                
-                poster_rect = [current_x, current_y, current_x + sum(col_widths), current_y + poster_height]
-                draw.rectangle(poster_rect, fill="#FFF8E1", outline=COLOR_TEXT_MAIN, width=2)
-                
-                draw.text((current_x + col_widths[0]/2, current_y + poster_height/2), str(rank), font=font_rank, fill=COLOR_TEXT_MAIN, anchor="mm")
-                draw.text((current_x + col_widths[0] + col_widths[1]/2, current_y + poster_height/2), nick, font=font_nick, fill=COLOR_TEXT_MAIN, anchor="mm")
-                draw.text((current_x + col_widths[0] + col_widths[1] + col_widths[2]/2, current_y + poster_height/2), score, font=font_score, fill=COLOR_TEXT_MAIN, anchor="mm")
-                
-            current_y += poster_height + poster_gap
-        current_x += sum(col_widths) + block_margin
+# --- [TV] 변경분 피드 (프로세스 공용, 순위표가 바뀔 때마다 갱신) ---
+@st.cache_resource
+def get_tv_feed():
+    feed = TvFeed()
+    cache = get_standings_cache()
+    cache.subscribe(feed.publish)
+    current_df, version = cache.get()
+    feed.publish(None, current_df, version, 'init')
+    return feed
 
-    # 규칙표 (기존 유지)
-    rule_start_y = current_y + 50
-    draw.line((100, rule_start_y-20, W-100, rule_start_y-20), fill=COLOR_TEXT_MAIN, width=5)
-    draw.text((W/2, rule_start_y), "BOUNTY RULES", font=font_title_sub, fill=COLOR_TEXT_MAIN, anchor="mm")
-    
-    rule_start_y += 40
-    rule_header_w = 160
-    rule_val_w = 110
-    rule_row_h = 45
-    
-    rules_data = [
-        ["3 FREE", "1st", "$7", "2nd", "$5", "3rd", "$3", "Rebuy", "$0.5"],
-        ["", "1st-2Chop", "$7", "3-Chop", "$6", "4-Chop", "$5", "", ""],
-        ["5 FREE ↑", "1st", "$10", "2nd", "$7", "3rd", "$5", "Rebuy", "$1"],
-        ["", "1st-2Chop", "$10", "3-Chop", "$9", "4-Chop", "$8", "", ""]
-    ]
-
-    curr_ry = rule_start_y
-    for r_data in rules_data:
-        curr_rx = (W - (rule_header_w + rule_val_w*8)) / 2
-        for col_idx, cell_text in enumerate(r_data):
-            cell_w = rule_header_w if col_idx == 0 else rule_val_w
-            if cell_text:
-                draw.rectangle([curr_rx, curr_ry, curr_rx+cell_w, curr_ry+rule_row_h], fill=COLOR_BROWN_BAR, outline=COLOR_TEXT_MAIN, width=2)
-                is_header = (col_idx == 0 or (col_idx > 0 and col_idx % 2 != 0))
-                fill_c = COLOR_GOLD if is_header else COLOR_LIGHT_TEXT
-                f_size = font_main if is_header else font_score
-                draw.text((curr_rx + cell_w/2, curr_ry + rule_row_h/2), cell_text, font=f_size, fill=fill_c, anchor="mm")
-            curr_rx += cell_w
-        curr_ry += rule_row_h
-
-    return image
+@st.cache_resource
+def load_tv_html(web_fonts):
+    with open(TV_TEMPLATE_FILE, encoding='utf-8') as f:
+        template = f.read()
+    html = render_tv_html(template, TV_ROWS_PER_PAGE, TV_ROTATE_SEC, TV_POLL_SEC)
+    return html.replace('__FONT_CSS__', font_face_css(web_fonts))
+
+# --- [TV] 키오스크 화면: 페이지 넘김과 변경분 반영은 브라우저가 직접 처리 ---
+# 스크립트는 처음 한 번만 실행되고, 이후에는 정적 feed.json만 확인하므로 재실행이 없다.
+def render_tv_board():
+    import streamlit.components.v1 as components
+    load_data()
+    get_tv_feed()
+    components.html(load_tv_html(load_web_fonts()), height=1080, scrolling=False)
 
 # ==========================================
 # 메인 앱 시작
 # ==========================================
+if TV_MODE:
+    render_tv_board()
+    st.stop()
+
 st.markdown(f"<div class='main-title'>🤠 WANTED: ACE's {CURRENT_MONTH}월 현상 수배자들</div>", unsafe_allow_html=True)
 
+start_warm_up()
 df = load_data()
+get_tv_feed()
+if WATCH_INTERVAL_SEC > 0:
+    watch_for_updates()
 existing_players = sorted([str(p) for p in df['닉네임'].unique() if p != "nan" and p != ""])
 
 # --- [사이드바] 블랙 & 골드 스타일 유지 ---
@@ -422,54 +466,87 @@ with st.sidebar.form("game_input", clear_on_submit=True):
     submit_btn = st.form_submit_button("🏆 점수 반영 및 저장")
 
 if submit_btn:
-    rule = SCORE_RULES[game_type]
-    updates = {} 
-    for name, rank in winners:
-        if name: name = str(name).strip()
-        if name:
-            pt = rule['normal'][rank] if isinstance(rank, int) else rule[rank]
-            updates[name] = updates.get(name, 0) + pt
-    if rebuy_text:
-        for line in rebuy_text.replace(',', '\n').split('\n'):
-            parts = line.strip().split()
-            if not parts: continue
-            try: count = int(parts[-1]); name = " ".join(parts[:-1])
-            except: count = 1; name = " ".join(parts)
-            if name: updates[name] = updates.get(name, 0) + (count * rule['rebuy'])
+    aliases = load_aliases()
+    updates, placed, rebuyers = score_game(game_type, winners, rebuy_text, lambda name: resolve_name(name, aliases))
 
     if not updates: 
         st.warning("⚠️ 입력된 정보가 없습니다.")
     else:
         # 데이터프레임 업데이트 (참여횟수 로직 제거됨)
-        for name, point in updates.items():
-            if name in df['닉네임'].values:
-                df.loc[df['닉네임'] == name, '점수'] += point
-            else:
-                new_row = pd.DataFrame({'닉네임': [name], '점수': [point]})
-                df = pd.concat([df, new_row], ignore_index=True)
+        df = apply_updates(df, updates)
         
-        save_data(df)
-        st.success(f"✅ 구글 시트 저장 완료! ({len(updates)}명 반영)")
-        st.rerun()
+        # 경기 결과(등수)도 함께 기록해 실력 레이팅 계산에 사용
+        game = {'type': game_type, 'result': result_type, 'places': game_places(placed, rebuyers)}
+        if save_data(df, action='submit', meta={'game': game}):
+            st.success(f"✅ 구글 시트 저장 완료! ({len(updates)}명 반영)")
+            st.rerun()
 
 # --- [사이드바] 데이터 관리 ---
 st.sidebar.markdown("<br><br>", unsafe_allow_html=True)
-with st.sidebar.expander("🗑️ 닉네임 삭제 (관리자용)"):
-    delete_targets = st.multiselect("삭제할 닉네임", existing_players)
-    if st.button("❌ 선택 삭제"):
-        if delete_targets:
-            new_df = df[~df['닉네임'].isin(delete_targets)]
-            save_data(new_df)
-            st.success("삭제 완료."); st.rerun()
+st.sidebar.link_button("📺 TV 화면 열기", "?view=tv", use_container_width=True)
+show_rating = st.sidebar.toggle("⭐ 실력 레이팅 표시", help="경기 결과(등수)로 계산한 Elo 방식 레이팅")
+with st.sidebar.expander("🗑️ 닉네임 정리 (관리자용)"):
+    # 합치기/이름 변경/삭제를 쌓아두었다가 한 번의 저장으로 반영
+    admin_queue = st.session_state.setdefault('admin_queue', [])
+    undo_stack = st.session_state.setdefault('admin_undo', [])
+
+    admin_mode = st.radio("작업", ["합치기", "이름 변경", "삭제"], horizontal=True)
+    if admin_mode == "합치기":
+        merge_sources = st.multiselect("합칠 닉네임 (중복 계정)", existing_players)
+        merge_target = st.selectbox("대표 닉네임", existing_players)
+        if st.button("➕ 합치기 추가") and merge_sources and merge_target:
+            admin_queue.append({'op': 'merge', 'sources': merge_sources, 'target': merge_target})
+    elif admin_mode == "이름 변경":
+        rename_old = st.selectbox("기존 닉네임", existing_players)
+        rename_new = st.text_input("새 닉네임")
+        if st.button("➕ 이름 변경 추가") and rename_old and rename_new.strip():
+            admin_queue.append({'op': 'rename', 'old': rename_old, 'new': rename_new.strip()})
+    else:
+        delete_targets = st.multiselect("삭제할 닉네임", existing_players)
+        if st.button("➕ 삭제 추가") and delete_targets:
+            admin_queue.append({'op': 'delete', 'names': delete_targets})
+
+    if admin_queue:
+        st.markdown("**대기 중인 작업**")
+        for op in admin_queue:
+            st.markdown(f"- {describe_op(op)}")
+        q1, q2 = st.columns(2)
+        if q1.button("✅ 일괄 적용"):
+            aliases = load_aliases()
+            try:
+                new_df, new_aliases = apply_admin_ops(df, admin_queue, aliases)
+            except ValueError as e:
+                st.error(f"⚠️ {e}")
+            else:
+                # 시트 저장이 성공했을 때만 별칭과 되돌리기 기록을 남긴다
+                if save_data(new_df, action='admin'):
+                    save_aliases(new_aliases)
+                    push_undo(undo_stack, make_undo_record(df, new_df, aliases, new_aliases, admin_queue))
+                    st.session_state['admin_queue'] = []
+                    st.success("정리 완료."); st.rerun()
+        if q2.button("🧹 비우기"):
+            st.session_state['admin_queue'] = []
+            st.rerun()
+
+    if undo_stack:
+        last = undo_stack[-1]
+        st.caption(f"마지막 정리: {last['time']} · {' / '.join(last['ops'])}")
+        if st.button("↩️ 되돌리기"):
+            # 정리 이후에 입력된 경기 점수는 유지하고, 정리로 바뀐 만큼만 되돌린다
+            undo_df, undo_aliases = apply_undo(df, load_aliases(), last)
+            if save_data(undo_df, action='undo'):
+                save_aliases(undo_aliases)
+                undo_stack.pop()
+                st.success("되돌리기 완료."); st.rerun()
 
 # =========================================================
 # [메인 화면] 랭킹 보드
 # =========================================================
 if not df.empty:
-    df['점수'] = df['점수'].astype(float)
     # 정렬 및 순위 계산 (동점자 처리)
-    rank_df = df.sort_values(by=['점수'], ascending=False).reset_index(drop=True)
-    rank_df['순위'] = rank_df['점수'].rank(method='min', ascending=False).astype(int)
+    rank_df = get_rank_tracker().attach(rank_standings(df))
+    if show_rating:
+        rank_df = attach_ratings(rank_df)
     
     max_val = rank_df['점수'].max()
 
@@ -477,7 +554,10 @@ if not df.empty:
         if sub_df.empty: return ""
         
         html_parts = []
-        html_parts.append('<table><thead><tr><th style="width:20%">Rank</th><th style="width:50%">Outlaw Name</th><th style="width:30%">Bounty</th></tr></thead><tbody>')
+        if show_rating:
+            html_parts.append('<table><thead><tr><th style="width:16%">Rank</th><th style="width:40%">Outlaw Name</th><th style="width:28%">Bounty</th><th style="width:16%">Rating</th></tr></thead><tbody>')
+        else:
+            html_parts.append('<table><thead><tr><th style="width:20%">Rank</th><th style="width:50%">Outlaw Name</th><th style="width:30%">Bounty</th></tr></thead><tbody>')
         
         for idx, row in sub_df.iterrows():
             percent = (row['점수'] / max_val * 100) if max_val > 0 else 0
@@ -498,7 +578,17 @@ if not df.empty:
                 box-shadow: inset 1px 1px 3px rgba(0,0,0,0.3);
             """
             
-            row_html = f'<tr class="wanted-poster"><td style="text-align:center; font-weight:bold;">{rank}</td><td style="text-align:center; {nick_style}">{row["닉네임"]}</td><td style="{bar_style}">${row["점수"]:.1f}</td></tr>'
+            rating_html = ""
+            if show_rating:
+                rating = f"{row['레이팅']:.0f}" if pd.notna(row['레이팅']) else "-"
+                rating_html = f'<td style="text-align:center; font-weight:bold;">{rating}</td>'
+            
+            # 직전 저장 대비 순위 변동 (▲ 상승 / ▼ 하락 / NEW 신규)
+            move = format_movement(row['변동'])
+            move_color = {'N': '#E65100', '▲': '#2E7D32', '▼': COLOR_RED}.get(move[0], COLOR_TEXT_MAIN)
+            move_html = f'<span style="font-size:0.75em; color:{move_color}; margin-left:6px;">{move}</span>' if move != "-" else ""
+            
+            row_html = f'<tr class="wanted-poster"><td style="text-align:center; font-weight:bold;">{rank}{move_html}</td><td style="text-align:center; {nick_style}">{row["닉네임"]}</td><td style="{bar_style}">${row["점수"]:.1f}</td>{rating_html}</tr>'
             html_parts.append(row_html)
             
         html_parts.append('</tbody></table>')
@@ -521,19 +611,29 @@ if not df.empty:
     
     with col_a:
         # use_container_width=True를 쓰면 버튼이 칸에 꽉 차서 보기 좋습니다.
+        # 렌더링은 작업 풀에서 진행되고, 같은 순위표/형식으로 동시에 누르면 같은 작업을 공유
+        poster_fmt = st.selectbox("수배지 형식", list(POSTER_FORMATS), format_func=lambda k: POSTER_FORMATS[k]['label'], label_visibility="collapsed")
+        poster_columns = POSTER_COLUMNS[:1] + [MOVEMENT_COLUMN] + POSTER_COLUMNS[1:] + ([RATING_COLUMN] if show_rating else [])
+        poster_cols = [c['key'] for c in poster_columns if c['key'] != '순위']
+        poster_key = f"{standings_version(rank_df)}-{CURRENT_MONTH}-{poster_fmt}-{'-'.join(poster_cols)}"
         if st.button("📜 현상 수배지(이미지) 발행", use_container_width=True):
-            with st.spinner("수배지 인쇄 중..."):
-                img = create_ranking_image(df)
-                if img:
-                    buf = io.BytesIO()
-                    img.save(buf, format="PNG")
-                    st.download_button("📥 수배지 다운로드", buf.getvalue(), f"wanted_list_{CURRENT_MONTH}.png", "image/png", use_container_width=True)
+            st.session_state['poster_job'] = get_poster_jobs().submit(poster_key, render_poster_file, rank_df[poster_cols].copy(), CURRENT_MONTH, poster_fmt, poster_columns)
+        if st.session_state.get('poster_job') == poster_key:
+            show_poster_job(poster_key)
     
     with col_b:
         # 오른쪽 칸을 다시 반으로 나눠서 버튼 2개를 배치
         b1, b2 = st.columns(2)
         with b1:
-            st.download_button("📂 장부(엑셀) 다운로드", rank_df.to_csv(index=False).encode('utf-8-sig'), "bounty_ledger.csv", "text/csv", use_container_width=True)
+            # 장부 파일은 버튼을 누를 때만 만들고, 같은 순위표 버전이면 캐시를 재사용
+            export_cache = get_export_cache()
+            ledger_version = standings_version(rank_df)
+            export_fmt = st.selectbox("장부 형식", available_formats(), format_func=lambda k: EXPORT_FORMATS[k][0], label_visibility="collapsed")
+            ledger_bytes = export_cache.peek(ledger_version, export_fmt)
+            if ledger_bytes is None and st.button("📂 장부 파일 만들기", use_container_width=True):
+                ledger_bytes = export_cache.get_or_build(ledger_version, export_fmt, rank_df)
+            if ledger_bytes is not None:
+                st.download_button("📂 장부 다운로드", ledger_bytes, export_filename(export_fmt, [CURRENT_MONTH]), EXPORT_FORMATS[export_fmt][1], use_container_width=True)
         with b2:
             # [추가] 새 탭에서 구글 시트 열기
             st.link_button("🔗 시트 바로가기", SHEET_URL, use_container_width=True)
@@ -541,8 +641,39 @@ if not df.empty:
     with st.expander("🛠️ 장부 직접 수정 (보안관용)"):
         edited_df = st.data_editor(rank_df, use_container_width=True, num_rows="dynamic")
         if st.button("💾 수정 사항 기록"):
-            save_data(edited_df[['닉네임', '점수']])
-            st.success("장부가 구글 시트에 수정되었습니다."); st.rerun()
+            if save_data(edited_df[['닉네임', '점수']], action='editor'):
+                st.success("장부가 구글 시트에 수정되었습니다."); st.rerun()
 
 else:
-    st.info("👈 사이드바에서 첫 번째 현상범을 등록해주세요! (구글 시트 연동 완료)")
\ No newline at end of file
+    st.info("👈 사이드바에서 첫 번째 현상범을 등록해주세요! (구글 시트 연동 완료)")
+
+# =========================================================
+# [하단] 시점 복원 (저널 기반, 시트 재다운로드 없음)
+# =========================================================
+with st.expander("⏪ 시점 복원 (보안관용)"):
+    journal = get_journal()
+    kst = timezone(timedelta(hours=9))
+    recent = journal.recent(10)
+    if recent:
+        st.markdown("**최근 변경 기록**")
+        for row in recent:
+            changed = ", ".join(f"{name} {before if before is not None else '-'}→{after if after is not None else '삭제'}" for name, before, after in row['d'][:5])
+            more = f" 외 {len(row['d']) - 5}명" if len(row['d']) > 5 else ""
+            st.caption(f"{datetime.fromtimestamp(row['t'], kst):%m/%d %H:%M:%S} · {ACTION_LABELS.get(row['a'], row['a'])} · {changed}{more}")
+
+    if journal.earliest is None:
+        st.info("아직 저장된 기록이 없습니다.")
+    else:
+        now_kst = datetime.now(kst)
+        r1, r2 = st.columns(2)
+        restore_date = r1.date_input("복원할 날짜", now_kst.date())
+        restore_time = r2.time_input("복원할 시각", now_kst.time().replace(microsecond=0), step=60)
+        restore_ts = datetime.combine(restore_date, restore_time, tzinfo=kst).timestamp()
+        restore_df = journal.state_at(restore_ts)
+        if restore_df.empty:
+            st.warning("⚠️ 해당 시점의 기록이 없습니다.")
+        else:
+            st.dataframe(rank_standings(restore_df)[['순위', '닉네임', '점수']], use_container_width=True, hide_index=True)
+            if st.button("⏪ 이 시점으로 복원"):
+                if save_data(restore_df, action='restore'):
+                    st.success("복원 완료."); st.rerun()
@@ -0,0 +1,164 @@
+# 부하 테스트용 가짜 gspread / google-auth
+# app.py가 쓰는 API(authorize, open().sheet1, batch_get, batch_clear, update)만 흉내 내고,
+# 호출마다 지연을 주며 일정 확률로 429(할당량 초과)를 낸다.
+import random
+import re
+import sys
+import threading
+import time
+import types
+
+
+class APIError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"APIError [{code}]: {message}")
+        self.code = code
+
+
+def _cell(ref):
+    col, row = re.match(r"([A-Z]+)(\d+)", ref).groups()
+    col_idx = 0
+    for ch in col:
+        col_idx = col_idx * 26 + (ord(ch) - 64)
+    return int(row), col_idx
+
+
+def _range(ref):
+    if ':' in ref:
+        start, end = ref.split(':')
+        return _cell(start), _cell(end)
+    r, c = _cell(ref)
+    return (r, c), None
+
+
+# --- [백엔드] 프로세스 공용 가짜 시트 ---
+class FakeSheetsBackend:
+    def __init__(self, latency=0.15, jitter=0.5, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.cells = {}
+        self.calls = []
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self, name):
+        with self._lock:
+            self.calls.append((time.time(), name))
+            fail = self._rng.random() < self.error_rate
+            delay = self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter))
+        time.sleep(max(0.0, delay))
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise APIError(429, "Quota exceeded for quota metric 'Read requests'")
+
+    def read(self, ref):
+        (r1, c1), end = _range(ref)
+        r2, c2 = end or (r1, c1)
+        with self._lock:
+            rows = []
+            for r in range(r1, r2 + 1):
+                row = [self.cells.get((r, c), '') for c in range(c1, c2 + 1)]
+                while row and row[-1] == '':
+                    row.pop()
+                rows.append(row)
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def clear(self, ref):
+        (r1, c1), end = _range(ref)
+        r2, c2 = end or (r1, c1)
+        with self._lock:
+            for r in range(r1, r2 + 1):
+                for c in range(c1, c2 + 1):
+                    self.cells.pop((r, c), None)
+
+    def write(self, ref, values):
+        (r1, c1), _ = _range(ref)
+        with self._lock:
+            for dr, row in enumerate(values):
+                for dc, value in enumerate(row):
+                    # 실제 시트처럼 문자열로 돌려준다 (7.0 -> "7")
+                    text = f"{value:g}" if isinstance(value, float) else str(value)
+                    self.cells[(r1 + dr, c1 + dc)] = text
+
+    def seed_players(self, n):
+        names = [f"플레이어{i:02d}" for i in range(1, n + 1)]
+        values = [[i + 1, name, float(n - i)] for i, name in enumerate(names)]
+        self.write('A6', values[:20])
+        if values[20:40]:
+            self.write('D6', values[20:40])
+        return names
+
+    def calls_per_minute(self, since):
+        with self._lock:
+            count = sum(1 for t, _ in self.calls if t >= since)
+        elapsed = max(time.time() - since, 1e-6)
+        return count * 60 / elapsed
+
+
+class FakeWorksheet:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def batch_get(self, ranges):
+        self.backend._call('batch_get')
+        return [self.backend.read(r) for r in ranges]
+
+    def batch_clear(self, ranges):
+        self.backend._call('batch_clear')
+        for r in ranges:
+            self.backend.clear(r)
+
+    def update(self, range_name=None, values=None):
+        self.backend._call('update')
+        self.backend.write(range_name, values)
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend):
+        self.sheet1 = FakeWorksheet(backend)
+
+
+class FakeClient:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open(self, name):
+        self.backend._call('open')
+        return FakeSpreadsheet(self.backend)
+
+
+class FakeCredentials:
+    @classmethod
+    def from_service_account_info(cls, info, scopes=None):
+        return cls()
+
+
+# --- [설치] import gspread / google.oauth2.service_account 를 가짜로 교체 ---
+def install(backend):
+    gspread = types.ModuleType('gspread')
+    gspread.authorize = lambda creds: FakeClient(backend)
+    gspread.exceptions = types.ModuleType('gspread.exceptions')
+    gspread.exceptions.APIError = APIError
+    sys.modules['gspread'] = gspread
+    sys.modules['gspread.exceptions'] = gspread.exceptions
+
+    service_account = types.ModuleType('google.oauth2.service_account')
+    service_account.Credentials = FakeCredentials
+    # google 네임스페이스는 streamlit(protobuf)도 쓰므로 없는 부분만 만든다
+    try:
+        import google.oauth2 as oauth2
+    except ImportError:
+        try:
+            import google
+        except ImportError:
+            google = sys.modules['google'] = types.ModuleType('google')
+        oauth2 = sys.modules['google.oauth2'] = types.ModuleType('google.oauth2')
+        google.oauth2 = oauth2
+    oauth2.service_account = service_account
+    sys.modules['google.oauth2.service_account'] = service_account
+    return backend
@@ -0,0 +1,195 @@
+# 다중 세션 부하 시뮬레이터
+#   python bench/load_sim.py --sessions 20 --duration 60 --latency 0.15 --error-rate 0.02
+# 가짜 gspread(fake_gspread.py)를 설치한 뒤 Streamlit AppTest로 실제 app.py 흐름을
+# 여러 세션이 동시에 돌린다 (순위표 보기 / 경기 입력 / 수배지 발행 / 장부 수정).
+# 세션들은 한 프로세스 안에서 돌아서 cache_resource(공용 캐시, 시트 감시 스레드 등)를 실제 서버처럼 공유한다.
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import fake_gspread  # noqa: E402
+
+# 행동별 비중 (보기가 대부분)
+ACTIONS = [('view', 60), ('submit', 20), ('poster', 10), ('edit', 10)]
+# 작업 폴더에 복사하지 않을 파일 (저널/별칭 등 실제 데이터가 오염되지 않게)
+SKIP_FILES = {'data', 'static', 'player_aliases.json', '.git', 'bench'}
+POSTER_WAIT_SEC = 30
+# app.py가 끝까지 실행됐는지 확인하는 화면 맨 아래 요소
+LAST_ELEMENT = "⏪ 시점 복원 (보안관용)"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def make_workdir():
+    # 앱은 모듈 위치 기준으로 data/, static/ 을 쓰므로, 모듈을 임시 폴더에 링크해 두고 그 사본을 실행한다
+    # (실제 저널/별칭/TV 피드가 오염되지 않게)
+    workdir = tempfile.mkdtemp(prefix="wanted_load_")
+    for name in os.listdir(ROOT):
+        if name in SKIP_FILES:
+            continue
+        os.symlink(os.path.join(ROOT, name), os.path.join(workdir, name))
+    # 웹 폰트 서브셋(수 초)은 측정 전에 앱 폴더에 한 번 만들어 두고 링크한다
+    # (실제 배포처럼 미리 만들어 둔 상태를 재며, warm_up 스레드가 측정 중에 fontTools를 돌리지 않게)
+    # (앱 폴더를 sys.path에 남기면 app.py가 저널 등을 원본에서 import하므로 fonts만 잠깐 불러오고 되돌린다)
+    sys.path.insert(0, ROOT)
+    try:
+        import fonts
+        fonts.build_web_fonts()
+    finally:
+        sys.path.remove(ROOT)
+        sys.modules.pop('fonts', None)
+    os.makedirs(os.path.join(workdir, 'static'))
+    os.symlink(fonts.STATIC_FONT_DIR, os.path.join(workdir, 'static', 'fonts'))
+    return workdir
+
+
+def find(elements, label):
+    for element in elements:
+        if getattr(element, 'label', None) == label:
+            return element
+    raise LookupError(label)
+
+
+# --- [세션] 한 명의 직원/손님 ---
+class SimSession:
+    def __init__(self, idx, players, rng, workdir):
+        from streamlit.testing.v1 import AppTest
+        self.idx = idx
+        self.players = players
+        self.rng = rng
+        # from_file의 상대 경로는 호출한 파일(bench/) 기준이므로 작업 폴더의 절대 경로를 넘긴다
+        self.at = AppTest.from_file(os.path.join(workdir, 'app.py'), default_timeout=60)
+        self.at.secrets['gcp_service_account'] = {'type': 'service_account', 'client_email': f"sim{idx}@example.com"}
+
+    def timed(self, fn):
+        start = time.perf_counter()
+        fn()
+        # 저장 후 st.rerun()으로 끊긴 실행은 AppTest가 중간까지 그린 화면을 돌려줄 때가 있어,
+        # 화면 맨 아래 요소가 없으면 한 번 더 실행한다 (브라우저도 다시 그린 화면을 받아야 끝나므로 시간에 포함)
+        if not any(getattr(e, 'label', None) == LAST_ELEMENT for e in self.at.expander):
+            self.at.run()
+        return time.perf_counter() - start
+
+    def view(self):
+        return self.timed(self.at.run)
+
+    def submit(self):
+        names = self.rng.sample(self.players, 3)
+        for label, name in zip(["🥇 1등", "🥈 2등", "🥉 3등"], names):
+            find(self.at.text_input, label).input(name)
+        return self.timed(find(self.at.button, "🏆 점수 반영 및 저장").click().run)
+
+    def poster(self):
+        elapsed = self.timed(find(self.at.button, "📜 현상 수배지(이미지) 발행").click().run)
+        deadline = time.time() + POSTER_WAIT_SEC
+        while time.time() < deadline and not self.at.get('download_button'):
+            time.sleep(0.2)
+            elapsed += self.timed(self.at.run)
+        return elapsed
+
+    def edit(self):
+        # AppTest에는 data_editor 입력 API가 없어서, 편집 내용(위젯 값)을 직접 실어 보낸다
+        editor = next(e for e in self.at.dataframe if e.proto.id)
+        ledger = editor.value
+        row = self.rng.randrange(len(ledger))
+        edits = {'edited_rows': {str(row): {'점수': float(ledger['점수'].iloc[row]) + 0.5}},
+                 'added_rows': [], 'deleted_rows': []}
+        find(self.at.button, "💾 수정 사항 기록").click()
+        states = self.at._tree.get_widget_states()
+        states.widgets.add(id=editor.proto.id, string_value=json.dumps(edits))
+        return self.timed(lambda: self.at._run(states))
+
+
+def run_session(session, stop_at, think_time, results, errors):
+    actions = [a for a, _ in ACTIONS]
+    weights = [w for _, w in ACTIONS]
+    try:
+        results['view'].append(session.view())
+    except Exception as e:
+        errors.append(f"세션 {session.idx} 시작 실패: {e}")
+        return
+    while time.time() < stop_at:
+        action = session.rng.choices(actions, weights)[0]
+        try:
+            results[action].append(getattr(session, action)())
+        except Exception as e:
+            errors.append(f"{action}: {type(e).__name__}: {e}")
+        time.sleep(session.rng.uniform(0, think_time * 2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ACE's Wanted List 다중 세션 부하 시뮬레이터")
+    parser.add_argument('--sessions', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=30, help="측정 시간 (초)")
+    parser.add_argument('--think-time', type=float, default=1.0, help="행동 사이 평균 대기 (초)")
+    parser.add_argument('--latency', type=float, default=0.15, help="가짜 시트 API 지연 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument('--players', type=int, default=40)
+    parser.add_argument('--watch-interval', type=int, default=20, help="WANTED_WATCH_INTERVAL (0이면 매번 시트 읽기)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    backend = fake_gspread.install(fake_gspread.FakeSheetsBackend(args.latency, error_rate=args.error_rate, seed=args.seed))
+    players = backend.seed_players(args.players)
+    os.environ['WANTED_WATCH_INTERVAL'] = str(args.watch_interval)
+
+    workdir = make_workdir()
+    os.chdir(workdir)
+    try:
+        rng = random.Random(args.seed)
+        sessions = [SimSession(i, players, random.Random(rng.random()), workdir) for i in range(args.sessions)]
+
+        results = {a: [] for a, _ in ACTIONS}
+        errors = []
+        started = time.time()
+        stop_at = started + args.duration
+        threads = [threading.Thread(target=run_session, args=(s, stop_at, args.think_time, results, errors), daemon=True)
+                   for s in sessions]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.time() - started
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"세션 {args.sessions}개 · {elapsed:.1f}초 · 시트 지연 {args.latency * 1000:.0f}ms · 429 비율 {args.error_rate:.0%}")
+    print(f"{'행동':<10}{'횟수':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    everything = []
+    for action, _ in ACTIONS:
+        values = [v * 1000 for v in results[action]]
+        everything.extend(values)
+        print(f"{action:<10}{len(values):>6}{percentile(values, 50):>10.0f}{percentile(values, 95):>10.0f}{percentile(values, 99):>10.0f}")
+    print(f"{'전체':<10}{len(everything):>6}{percentile(everything, 50):>10.0f}{percentile(everything, 95):>10.0f}{percentile(everything, 99):>10.0f}")
+    if everything:
+        print(f"평균 재실행 시간: {statistics.mean(everything):.0f}ms")
+    print(f"시트 API 호출: {len(backend.calls)}회 ({backend.calls_per_minute(started):.0f}회/분), 429: {backend.errors}회")
+    # tracemalloc은 할당마다 추적 비용이 들어 재실행 시간을 몇 배로 부풀리므로 쓰지 않는다 (RSS만)
+    print(f"최대 메모리: RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f}MB")
+    if errors:
+        print(f"오류 {len(errors)}건 (처음 5건):")
+        for message in errors[:5]:
+            print(f"  - {message}")
+
+
+if __name__ == '__main__':
+    main()
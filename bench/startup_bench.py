@@ -0,0 +1,81 @@
+# 콜드 스타트 벤치마크
+#   python bench/startup_bench.py [--repeat 5]
+# 매 측정마다 새 파이썬 프로세스를 띄워서 (1) 모듈 import 시간과
+# (2) Streamlit AppTest로 app.py 첫 실행 / 재실행 시간을 잰다.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import streamlit, pandas
+t1 = time.perf_counter()
+import admin_ops, fonts, standings, exporter
+t2 = time.perf_counter()
+import PIL.Image, PIL.ImageDraw
+t3 = time.perf_counter()
+import gspread
+from google.oauth2 import service_account
+t4 = time.perf_counter()
+print(json.dumps({
+    'streamlit+pandas': t1 - t0,
+    'app modules': t2 - t1,
+    'PIL (lazy)': t3 - t2,
+    'gspread+google-auth (lazy)': t4 - t3,
+}))
+"""
+
+APP_PROBE = """
+import json, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file('app.py', default_timeout=60)
+t1 = time.perf_counter()
+at.run()
+t2 = time.perf_counter()
+at.run()
+t3 = time.perf_counter()
+print(json.dumps({
+    'AppTest import': t1 - t0,
+    'first run (cold)': t2 - t1,
+    'rerun (warm)': t3 - t2,
+}))
+"""
+
+
+def run_probe(code):
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "probe failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ACE's Wanted List 콜드 스타트 벤치마크")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    samples = {}
+    for probe in (IMPORT_PROBE, APP_PROBE):
+        for _ in range(args.repeat):
+            try:
+                timings = run_probe(probe)
+            except RuntimeError as e:
+                print(f"⚠️ 측정 실패: {e}")
+                break
+            for name, value in timings.items():
+                samples.setdefault(name, []).append(value * 1000)
+
+    print(f"{'항목':<30}{'median(ms)':>12}{'min(ms)':>10}{'max(ms)':>10}")
+    for name, values in samples.items():
+        print(f"{name:<30}{statistics.median(values):>12.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
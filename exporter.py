@@ -0,0 +1,125 @@
+import importlib.util
+import io
+import threading
+from collections import OrderedDict
+
+# --- [설정] 장부 내보내기 형식 ---
+# 형식 키: (표시 이름, MIME, 확장자, 필요한 패키지)
+EXPORT_FORMATS = {
+    'xlsx': ("엑셀 (.xlsx)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx", 'openpyxl'),
+    'csv': ("CSV (.csv)", "text/csv", "csv", None),
+    'parquet': ("Parquet (.parquet)", "application/octet-stream", "parquet", 'pyarrow'),
+}
+EXPORT_COLUMNS = ['순위', '닉네임', '점수']
+CHUNK_ROWS = 5000
+
+
+def available_formats():
+    return [k for k, (_, _, _, dep) in EXPORT_FORMATS.items()
+            if dep is None or importlib.util.find_spec(dep) is not None]
+
+
+def export_filename(fmt, months):
+    label = "_".join(f"{m}월" for m in months)
+    return f"bounty_ledger_{label}.{EXPORT_FORMATS[fmt][2]}"
+
+
+# --- [함수] 여러 달 장부를 청크 단위로 나누기 ---
+def _frames(frames):
+    # 단일 DataFrame이면 한 달짜리로 본다. {월: DataFrame}이면 '월' 컬럼을 붙인다.
+    if hasattr(frames, 'columns'):
+        yield None, frames[[c for c in EXPORT_COLUMNS if c in frames.columns]]
+        return
+    for month, df in frames.items():
+        yield month, df[[c for c in EXPORT_COLUMNS if c in df.columns]]
+
+
+def iter_chunks(frames, chunk_rows=CHUNK_ROWS):
+    for month, df in _frames(frames):
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            if month is not None:
+                chunk = chunk.assign(월=month)[['월'] + list(chunk.columns)]
+            yield chunk
+
+
+def _write_csv(frames, out, chunk_rows):
+    out.write(b'\xef\xbb\xbf')  # 엑셀에서 한글이 깨지지 않도록 BOM
+    header = True
+    for chunk in iter_chunks(frames, chunk_rows):
+        out.write(chunk.to_csv(index=False, header=header).encode('utf-8'))
+        header = False
+
+
+def _write_xlsx(frames, out, chunk_rows):
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("장부")
+    header = True
+    for chunk in iter_chunks(frames, chunk_rows):
+        if header:
+            ws.append(list(chunk.columns))
+            header = False
+        for row in chunk.itertuples(index=False):
+            ws.append([v.item() if hasattr(v, 'item') else v for v in row])
+    wb.save(out)
+
+
+def _write_parquet(frames, out, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for chunk in iter_chunks(frames, chunk_rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+WRITERS = {'csv': _write_csv, 'xlsx': _write_xlsx, 'parquet': _write_parquet}
+
+
+# --- [함수] 내보내기 (파일 객체/경로로 스트리밍) ---
+def write_export(frames, fmt, out, chunk_rows=CHUNK_ROWS):
+    WRITERS[fmt](frames, out, chunk_rows)
+
+
+def export_to_path(frames, fmt, path, chunk_rows=CHUNK_ROWS):
+    with open(path, 'wb') as f:
+        write_export(frames, fmt, f, chunk_rows)
+    return path
+
+
+def export_bytes(frames, fmt):
+    buf = io.BytesIO()
+    write_export(frames, fmt, buf)
+    return buf.getvalue()
+
+
+# --- [캐시] 순위표 버전별 내보내기 결과 ---
+class ExportCache:
+    def __init__(self, max_items=12):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def peek(self, version, fmt):
+        with self._lock:
+            data = self._items.get((version, fmt))
+            if data is not None:
+                self._items.move_to_end((version, fmt))
+            return data
+
+    def get_or_build(self, version, fmt, frames):
+        data = self.peek(version, fmt)
+        if data is None:
+            data = export_bytes(frames, fmt)
+            with self._lock:
+                self._items[(version, fmt)] = data
+                while len(self._items) > self.max_items:
+                    self._items.popitem(last=False)
+        return data
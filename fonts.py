@@ -0,0 +1,179 @@
+import hashlib
+import importlib.util
+import io
+import os
+import shutil
+import threading
+from functools import lru_cache
+
+# --- [설정] 번들 폰트 (글꼴/ 폴더) ---
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '글꼴')
+FONT_FILES = {
+    'rye': 'Rye-Regular.ttf',
+    'playfair': 'PlayfairDisplay-Bold.ttf',
+    'hahmlet_black': 'Hahmlet-Black.ttf',
+    'hahmlet_bold': 'Hahmlet-Bold.ttf',
+    'nanum': 'NanumSquareRoundB.ttf',
+}
+
+# --- [설정] 수배지(Pillow) 용도별 폰트 ---
+POSTER_FONT_ROLES = {
+    'title': 'rye',             # WANTED
+    'subtitle': 'hahmlet_black', # ACE's PUB - N월 현상 수배자
+    'header': 'playfair',       # Rank / Name / Bounty
+    'nick': 'nanum',            # 닉네임 (한글)
+    'number': 'playfair',       # 순위, 점수
+    'rule': 'nanum',            # 규칙표 (↑ 등 기호 포함)
+}
+
+# --- [설정] 웹 폰트 (정적 파일로 서빙) ---
+# Streamlit은 실행 위치와 상관없이 <앱 폴더>/static 을 서빙하므로 모듈 위치 기준으로 잡는다
+STATIC_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'fonts')
+STATIC_FONT_URL = 'app/static/fonts'
+LATIN_TEXT = ''.join(chr(c) for c in range(0x20, 0x7F)) + '₩·…“”‘’'
+UI_SYMBOLS = '▲▼↑←→·'
+
+# (CSS font-family, 폰트 키, weight, 글리프 집합, preload 여부)
+WEB_FONTS = [
+    ('Rye', 'rye', 400, 'latin', True),
+    ('Playfair Display', 'playfair', 700, 'latin', True),
+    ('NanumSquareRound', 'nanum', 700, 'korean', False),
+]
+
+
+def font_path(key):
+    return os.path.join(FONT_DIR, FONT_FILES[key])
+
+
+# --- [함수] 포스터용 폰트 레지스트리 (프로세스당 한 번 로드) ---
+# 폰트 파일 바이트는 프로세스 공용, FreeType 객체는 스레드마다 따로 만든다 (FT_Face는 스레드 안전하지 않음)
+_thread_fonts = threading.local()
+
+
+@lru_cache(maxsize=None)
+def font_bytes(key):
+    with open(font_path(key), 'rb') as f:
+        return f.read()
+
+
+def get_font(role, size):
+    from PIL import ImageFont
+    cache = getattr(_thread_fonts, 'cache', None)
+    if cache is None:
+        cache = _thread_fonts.cache = {}
+    font = cache.get((role, size))
+    if font is None:
+        font = ImageFont.truetype(io.BytesIO(font_bytes(POSTER_FONT_ROLES[role])), size)
+        cache[(role, size)] = font
+    return font
+
+
+def preload_font_bytes():
+    # 미리 데울 수 있는 건 프로세스 공용인 폰트 바이트뿐이다
+    # (FreeType 객체는 스레드마다 따로라, 다른 스레드에서 만들어 두면 스레드가 끝날 때 버려진다)
+    for key in FONT_FILES:
+        font_bytes(key)
+
+
+# --- [함수] 글리프 집합 ---
+@lru_cache(maxsize=None)
+def korean_text():
+    # KS X 1001 완성형 한글 2,350자 + 라틴 + UI 기호: 닉네임에 쓰이는 글자 대부분을 덮는다
+    chars = []
+    for lead in range(0xB0, 0xC9):
+        for trail in range(0xA1, 0xFF):
+            try:
+                chars.append(bytes([lead, trail]).decode('euc-kr'))
+            except UnicodeDecodeError:
+                pass
+    return LATIN_TEXT + UI_SYMBOLS + ''.join(chars)
+
+
+def glyph_text(charset):
+    return korean_text() if charset == 'korean' else LATIN_TEXT + UI_SYMBOLS
+
+
+# --- [함수] 서브셋 웹 폰트 생성 ---
+def _web_flavor():
+    if importlib.util.find_spec('fontTools') is None:
+        return None
+    return 'woff2' if importlib.util.find_spec('brotli') else 'woff'
+
+
+def _subset(src, dst, text, flavor):
+    from fontTools import subset
+    options = subset.Options()
+    options.flavor = flavor
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    subsetter = subset.Subsetter(options=options)
+    font = subset.load_font(src, options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    tmp_dst = dst + '.tmp'
+    subset.save_font(font, tmp_dst, options)
+    os.replace(tmp_dst, dst)
+
+
+@lru_cache(maxsize=None)
+def _font_digest(key, charset):
+    digest = hashlib.sha1(font_bytes(key))
+    digest.update(glyph_text(charset).encode('utf-8'))
+    return digest.hexdigest()[:10]
+
+
+def build_web_fonts(out_dir=STATIC_FONT_DIR, subset=True):
+    # 파일명에 원본+글리프 해시를 넣어 내용이 바뀌지 않는 한 브라우저 캐시를 그대로 쓰게 한다.
+    # subset=False면 서브셋을 새로 만들지 않는다: 이미 있으면 그것을, 없으면 원본 TTF 복사본을 쓴다.
+    # (서브셋 생성은 수 초가 걸리므로 첫 화면에서는 subset=False, 백그라운드/빌드 단계에서 subset=True)
+    os.makedirs(out_dir, exist_ok=True)
+    flavor = _web_flavor()
+    entries = []
+    for family, key, weight, charset, preload in WEB_FONTS:
+        src = font_path(key)
+        if not os.path.exists(src):
+            continue
+        digest = _font_digest(key, charset)
+        filename = f"{key}-{digest}.{flavor}" if flavor else None
+        if flavor and not os.path.exists(os.path.join(out_dir, filename)):
+            if subset:
+                _subset(src, os.path.join(out_dir, filename), glyph_text(charset), flavor)
+            else:
+                filename = None
+        if filename is None:
+            filename = f"{key}-{digest}.ttf"
+            dst = os.path.join(out_dir, filename)
+            if not os.path.exists(dst):
+                shutil.copyfile(src, dst + '.tmp')
+                os.replace(dst + '.tmp', dst)
+        ext = filename.rsplit('.', 1)[1]
+        entries.append({
+            'family': family,
+            'weight': weight,
+            'url': f"{STATIC_FONT_URL}/{filename}",
+            'format': {'woff2': 'woff2', 'woff': 'woff'}.get(ext, 'truetype'),
+            'preload': preload,
+        })
+    return entries
+
+
+def font_face_css(entries):
+    return "\n".join(
+        f"@font-face {{ font-family: '{e['family']}'; font-weight: {e['weight']}; font-style: normal; "
+        f"font-display: swap; src: url('{e['url']}') format('{e['format']}'); }}"
+        for e in entries
+    )
+
+
+def preload_links(entries):
+    mime = {'woff2': 'font/woff2', 'woff': 'font/woff', 'truetype': 'font/ttf'}
+    return "\n".join(
+        f'<link rel="preload" href="{e["url"]}" as="font" type="{mime[e["format"]]}" crossorigin>'
+        for e in entries if e['preload']
+    )
+
+
+# 배포 이미지 빌드 단계에서 미리 서브셋을 만들어 두려면: python fonts.py
+if __name__ == '__main__':
+    for entry in build_web_fonts():
+        print(entry['url'])
@@ -0,0 +1,224 @@
+import bisect
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+
+import pandas as pd
+
+# --- [설정] 변경 기록(저널) 파일 ---
+# 최근 변경분은 일반 JSONL(LIVE_FILE)에 한 줄씩 덧붙이고, 체크포인트마다 그 묶음을
+# gzip 멤버 하나로 압축해 JOURNAL_FILE로 옮긴다 (한 줄짜리 변경분은 따로 압축하면 오히려 커진다)
+# 실행 위치와 상관없이 <앱 폴더>/data 를 쓴다 (다른 곳에서 실행하면 빈 저널로 시작하지 않도록)
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+JOURNAL_FILE = os.path.join(JOURNAL_DIR, 'journal.jsonl.gz')
+LIVE_FILE = os.path.join(JOURNAL_DIR, 'journal.jsonl')
+CHECKPOINT_FILE = os.path.join(JOURNAL_DIR, 'checkpoints.jsonl.gz')
+CHECKPOINT_EVERY = 50
+
+ACTION_LABELS = {
+    'baseline': "기준점",
+    'submit': "경기 결과 입력",
+    'admin': "닉네임 정리",
+    'undo': "정리 되돌리기",
+    'editor': "장부 직접 수정",
+    'restore': "시점 복원",
+    'sheet': "시트 직접 수정",
+}
+
+
+def standings_dict(df):
+    if df is None or df.empty:
+        return {}
+    return {str(name): round(float(score), 4) for name, score in zip(df['닉네임'], df['점수'])}
+
+
+def diff_standings(old, new):
+    # [닉네임, 이전 점수, 새 점수] (없던 사람/삭제된 사람은 None)
+    changes = []
+    for name in old.keys() | new.keys():
+        before, after = old.get(name), new.get(name)
+        if before != after:
+            changes.append([name, before, after])
+    return sorted(changes)
+
+
+def _dumps(row):
+    return json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def _truncate(path, size):
+    with open(path, 'r+b') as f:
+        f.truncate(size)
+
+
+def _read_jsonl_gz(path):
+    # 온전한 gzip 멤버까지만 읽고, 기록 도중 종료되어 깨진 꼬리는 잘라낸다
+    # (잘라내지 않으면 이후에 덧붙인 멤버가 깨진 조각 뒤에 묻혀 다시 읽히지 않는다)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    rows, pos, view = [], 0, memoryview(data)
+    while pos < len(data):
+        d = zlib.decompressobj(wbits=31)
+        try:
+            text = d.decompress(view[pos:])
+            if not d.eof:
+                break
+            member_rows = [json.loads(line) for line in text.decode('utf-8').splitlines() if line]
+        except (zlib.error, UnicodeDecodeError, json.JSONDecodeError):
+            break
+        rows.extend(member_rows)
+        pos = len(data) - len(d.unused_data)
+    if pos < len(data):
+        _truncate(path, pos)
+    return rows
+
+
+def _append_jsonl_gz(path, rows):
+    # 묶음 하나를 gzip 멤버 하나로 덧붙인다 (이어 붙인 멤버는 한 파일로 읽힌다)
+    with open(path, 'ab') as f:
+        f.write(gzip.compress(''.join(_dumps(row) for row in rows).encode('utf-8')))
+
+
+def _read_jsonl(path):
+    # 마지막 줄이 반쯤 쓰였으면 온전한 줄까지만 남기고 잘라낸다
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    rows, good = [], 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b'\n'):
+            break
+        try:
+            rows.append(json.loads(line))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            break
+        good += len(line)
+    if good < len(data):
+        _truncate(path, good)
+    return rows
+
+
+def _append_jsonl(path, row):
+    with open(path, 'ab') as f:
+        f.write(_dumps(row).encode('utf-8'))
+
+
+# --- [저널] 점수 변경분 기록 + 주기적 체크포인트 ---
+# 레코드: {"q": 순번, "t": 시각(epoch), "a": 작업, "d": [[닉네임, 이전, 이후], ...]}
+# 체크포인트: {"q": 순번, "t": 시각, "s": {닉네임: 점수}}
+class Journal:
+    def __init__(self, journal_file=JOURNAL_FILE, checkpoint_file=CHECKPOINT_FILE, checkpoint_every=CHECKPOINT_EVERY,
+                 live_file=LIVE_FILE):
+        self.journal_file = journal_file
+        self.live_file = live_file
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_every = checkpoint_every
+        self._lock = threading.Lock()
+        self._listeners = []
+        os.makedirs(os.path.dirname(journal_file) or '.', exist_ok=True)
+
+        self.records = _read_jsonl_gz(journal_file)
+        # 압축해 옮긴 직후 LIVE_FILE을 비우기 전에 종료됐으면 같은 레코드가 양쪽에 있으므로 건너뛴다
+        sealed_seq = self.records[-1]['q'] if self.records else 0
+        self._live = [r for r in _read_jsonl(live_file) if r['q'] > sealed_seq]
+        self.records += self._live
+        self.checkpoints = _read_jsonl_gz(checkpoint_file)
+        self._checkpoint_times = [c['t'] for c in self.checkpoints]
+        self._record_seqs = [r['q'] for r in self.records]
+        self.seq = max([r['q'] for r in self.records] + [c['q'] for c in self.checkpoints] + [0])
+        self.state = self._replay(float('inf'))
+
+    # --- 기록 ---
+    def record(self, new_df, action, meta=None):
+        new = standings_dict(new_df)
+        with self._lock:
+            if not self.checkpoints:
+                # 첫 기록은 변경분 대신 전체 기준점으로 남긴다
+                self._write_checkpoint(new, 'baseline')
+                self.state = new
+                return None
+            changes = diff_standings(self.state, new)
+            if not changes:
+                return None
+            self.seq += 1
+            row = {'q': self.seq, 't': time.time(), 'a': action, 'd': changes}
+            if meta:
+                row['m'] = meta
+            _append_jsonl(self.live_file, row)
+            self._live.append(row)
+            self.records.append(row)
+            self._record_seqs.append(row['q'])
+            self.state = new
+            if self.seq - self.checkpoints[-1]['q'] >= self.checkpoint_every:
+                self._seal()
+                self._write_checkpoint(new)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(row)
+            except Exception:
+                pass
+        return row
+
+    def subscribe(self, listener):
+        # 새 변경분이 기록될 때마다 listener(row) 호출
+        with self._lock:
+            self._listeners.append(listener)
+
+    def on_standings_change(self, old_df, new_df, version, source, meta=None):
+        self.record(new_df, source, meta)
+
+    def _seal(self):
+        # 최근 변경분을 압축 파일로 옮기고 LIVE_FILE을 비운다
+        if self._live:
+            _append_jsonl_gz(self.journal_file, self._live)
+            open(self.live_file, 'wb').close()
+            self._live = []
+
+    def _write_checkpoint(self, state, action=None):
+        ckpt = {'q': self.seq, 't': time.time(), 's': state}
+        if action:
+            ckpt['a'] = action
+        _append_jsonl_gz(self.checkpoint_file, [ckpt])
+        self.checkpoints.append(ckpt)
+        self._checkpoint_times.append(ckpt['t'])
+
+    # --- 복원 ---
+    def _replay(self, until):
+        # until 시각 이전의 가장 가까운 체크포인트에서 시작해 변경분만 다시 적용
+        idx = bisect.bisect_right(self._checkpoint_times, until) - 1
+        if idx < 0:
+            return {}
+        ckpt = self.checkpoints[idx]
+        state = dict(ckpt['s'])
+        start = bisect.bisect_right(self._record_seqs, ckpt['q'])
+        for row in self.records[start:]:
+            if row['t'] > until:
+                break
+            for name, _, after in row['d']:
+                if after is None:
+                    state.pop(name, None)
+                else:
+                    state[name] = after
+        return state
+
+    def state_at(self, timestamp):
+        with self._lock:
+            state = self._replay(timestamp)
+        return pd.DataFrame({'닉네임': list(state.keys()), '점수': list(state.values())})
+
+    def recent(self, limit=20):
+        with self._lock:
+            return list(reversed(self.records[-limit:]))
+
+    @property
+    def earliest(self):
+        return self.checkpoints[0]['t'] if self.checkpoints else None
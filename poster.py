@@ -0,0 +1,269 @@
+import io
+import math
+import zipfile
+from functools import lru_cache
+
+from fonts import get_font
+from standings import format_movement, rank_standings
+from theme import (BG_IMAGE_FILE, COLOR_TEXT_MAIN, COLOR_RED, COLOR_GOLD,
+                   COLOR_BROWN_BAR, COLOR_LIGHT_TEXT, COLOR_PAPER)
+
+# --- [설정] 수배지 출력 형식 ---
+POSTER_FORMATS = {
+    'classic': {'label': "기본 (1000x1400)", 'size': (1000, 1400)},
+    'story': {'label': "인스타 스토리 (1080x1920)", 'size': (1080, 1920)},
+    'square': {'label': "정사각형 (1080x1080)", 'size': (1080, 1080)},
+}
+
+# --- [설정] 순위표 컬럼 (DataFrame 컬럼, 헤더, 너비 비율, 폰트 용도, 표시 형식) ---
+POSTER_COLUMNS = [
+    {'key': '순위', 'header': 'Rank', 'weight': 60, 'role': 'number', 'format': str},
+    {'key': '닉네임', 'header': 'Name', 'weight': 240, 'role': 'nick', 'format': str},
+    {'key': '점수', 'header': 'Bounty', 'weight': 100, 'role': 'number', 'format': lambda v: f"${v:.1f}"},
+]
+
+# 선택 컬럼: 순위 변동 (직전 저장 대비), 'fit'의 글자는 최소 글자 크기로 말줄임 없이 들어가도록 폭을 보장
+MOVEMENT_COLUMN = {'key': '변동', 'header': '', 'weight': 60, 'role': 'rule', 'format': format_movement,
+                   'fit': ('NEW', '▲10', '▼10')}
+
+# 선택 컬럼: 실력 레이팅 (경기 기록이 없으면 '-')
+RATING_COLUMN = {'key': '레이팅', 'header': 'Rating', 'weight': 90, 'role': 'number',
+                 'format': lambda v: f"{v:.0f}" if v == v else "-"}
+
+BOUNTY_RULE_ROWS = [
+    ["3 FREE", "1st", "$7", "2nd", "$5", "3rd", "$3", "Rebuy", "$0.5"],
+    ["", "1st-2Chop", "$7", "3-Chop", "$6", "4-Chop", "$5", "", ""],
+    ["5 FREE ↑", "1st", "$10", "2nd", "$7", "3rd", "$5", "Rebuy", "$1"],
+    ["", "1st-2Chop", "$10", "3-Chop", "$9", "4-Chop", "$8", "", ""],
+]
+
+# --- [설정] 기준 치수 (1000x1400 캔버스 기준, 실제 크기에 비례해 조정) ---
+BASE_W, BASE_H = 1000, 1400
+BASE = {
+    'margin': 40, 'block_margin': 80, 'min_block_w': 380,
+    'title_y': 80, 'sub_y': 160, 'line_y': 190, 'table_top': 230,
+    'table_header_h': 50, 'row_h': 45, 'row_gap': 10, 'min_row_h': 30, 'min_row_gap': 6,
+    'max_row_h': 90, 'max_row_gap': 18, 'max_block_w': 640,
+    'rules_h': 300, 'bottom': 30, 'rule_row_h': 45,
+    'title_size': 100, 'sub_size': 45, 'header_size': 30, 'rule_head_size': 30, 'rule_val_size': 28,
+}
+
+
+# --- [레이아웃] 인원수와 캔버스 크기로 블록/행/페이지 계산 ---
+def compute_layout(n_rows, size, columns=POSTER_COLUMNS, show_rules=True):
+    W, H = size
+    s = min(W / BASE_W, H / BASE_H)
+    d = {k: v * s for k, v in BASE.items()}
+
+    rules_h = d['rules_h'] if show_rules else 0
+    avail = H - d['table_top'] - d['table_header_h'] - rules_h - d['bottom']
+    n_blocks = max(1, int((W - 2 * d['margin'] + d['block_margin']) // (d['min_block_w'] + d['block_margin'])))
+    block_w = (W - 2 * d['margin'] - (n_blocks - 1) * d['block_margin']) / n_blocks
+
+    pitch = d['row_h'] + d['row_gap']
+    min_pitch = d['min_row_h'] + d['min_row_gap']
+    rows_fit = max(1, int((avail + d['row_gap']) // pitch))
+    rows_max = max(1, int((avail + d['min_row_gap']) // min_pitch))
+    n = max(n_rows, 1)
+
+    if n <= rows_fit:
+        # 한 블록에 다 들어가면 남는 높이만큼 행을 키움 (최대 행 높이까지)
+        rows_per_block = n
+        pitch = min((avail + d['row_gap']) / n, d['max_row_h'] + d['max_row_gap'])
+        pages = 1
+    elif n <= n_blocks * rows_fit:
+        # 기본 크기로 한 장에 들어감 (앞 블록부터 채움)
+        rows_per_block = rows_fit
+        pages = 1
+    elif n <= n_blocks * rows_max:
+        # 행 높이를 줄여서 한 장에 맞춤
+        rows_per_block = math.ceil(n / n_blocks)
+        pitch = (avail + d['min_row_gap']) / rows_per_block
+        pages = 1
+    else:
+        # 최소 행 높이로도 넘치면 여러 장으로 나눔
+        rows_per_block = rows_max
+        pitch = min_pitch
+        pages = math.ceil(n / (n_blocks * rows_max))
+
+    row_h = pitch * BASE['row_h'] / (BASE['row_h'] + BASE['row_gap'])
+    # 쓰는 블록이 적으면 (인원이 적은 한 장짜리) 남는 폭만큼 블록을 넓히고 가운데로 모음
+    used_blocks = min(n_blocks, math.ceil(n / rows_per_block)) if pages == 1 else n_blocks
+    if used_blocks < n_blocks:
+        block_w = max(block_w, min(d['max_block_w'], (W - 2 * d['margin'] - (used_blocks - 1) * d['block_margin']) / used_blocks))
+    blocks_x = (W - used_blocks * block_w - (used_blocks - 1) * d['block_margin']) / 2
+    return {
+        'size': (W, H), 'scale': s, 'dims': d, 'pages': pages,
+        'blocks': n_blocks, 'rows_per_block': rows_per_block, 'per_page': n_blocks * rows_per_block,
+        'block_w': block_w, 'row_h': row_h, 'pitch': pitch, 'blocks_x': blocks_x,
+        'col_widths': column_widths(block_w, columns, row_h),
+        'rules_top': d['table_top'] + d['table_header_h'] + avail + d['bottom'] if show_rules else None,
+    }
+
+
+def column_widths(block_w, columns, row_h):
+    # 너비 비율대로 나누되, 'fit' 글자가 최소 글자 크기(_draw_page/draw_fitted와 같은 계산)로도
+    # 안 들어가는 컬럼은 최소 폭을 주고 나머지 컬럼에서 비율대로 덜어낸다
+    total_weight = sum(c['weight'] for c in columns)
+    widths = [block_w * c['weight'] / total_weight for c in columns]
+    mins = []
+    for col in columns:
+        max_size = max(8, int(row_h * (0.71 if col['role'] == 'nick' else 0.65)))
+        min_size = max(8, int(max_size * 0.5))
+        mins.append(max((text_width(t, col['role'], min_size) + 9 for t in col.get('fit', ())), default=0))
+    short = {i for i, (w, m) in enumerate(zip(widths, mins)) if w < m}
+    if not short:
+        return widths
+    spare = block_w - sum(mins[i] for i in short)
+    rest_weight = sum(c['weight'] for i, c in enumerate(columns) if i not in short)
+    return [mins[i] if i in short else spare * c['weight'] / rest_weight for i, c in enumerate(columns)]
+
+
+# --- [텍스트] 글자 폭 측정 / 칸에 맞추기 (결과 캐시) ---
+@lru_cache(maxsize=8192)
+def text_width(text, role, size):
+    return get_font(role, size).getlength(text)
+
+
+@lru_cache(maxsize=4096)
+def fit_text(text, role, max_w, max_size, min_size):
+    # 들어가는 가장 큰 글자 크기를 이분 탐색, 최소 크기로도 넘치면 말줄임
+    if text_width(text, role, max_size) <= max_w:
+        return text, max_size
+    lo, hi = min_size, max_size
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if text_width(text, role, mid) <= max_w:
+            lo = mid
+        else:
+            hi = mid - 1
+    if text_width(text, role, lo) <= max_w:
+        return text, lo
+    while len(text) > 1 and text_width(text + "…", role, min_size) > max_w:
+        text = text[:-1]
+    return text + "…", min_size
+
+
+def draw_fitted(draw, center, text, role, max_w, max_size, fill, min_ratio=0.5):
+    max_size = max(8, int(max_size))
+    fitted, size = fit_text(text, role, int(max_w), max_size, max(8, int(max_size * min_ratio)))
+    draw.text(center, fitted, font=get_font(role, size), fill=fill, anchor="mm")
+
+
+# --- [이미지] 배경은 크기별로 한 번만 읽어서 복사해 사용 ---
+@lru_cache(maxsize=4)
+def load_background(W, H, bg_file=BG_IMAGE_FILE):
+    from PIL import Image
+    return Image.open(bg_file).resize((W, H))
+
+
+def _draw_page(draw, layout, page_rows, columns, title, rule_rows):
+    W, H = layout['size']
+    d = layout['dims']
+
+    draw_fitted(draw, (W / 2, d['title_y']), "WANTED", 'title', W - 2 * d['margin'], d['title_size'], COLOR_RED)
+    draw_fitted(draw, (W / 2, d['sub_y']), title, 'subtitle', W - 2 * d['margin'], d['sub_size'], COLOR_TEXT_MAIN)
+    draw.line((100 * layout['scale'], d['line_y'], W - 100 * layout['scale'], d['line_y']), fill=COLOR_TEXT_MAIN, width=max(2, round(5 * layout['scale'])))
+
+    col_widths = layout['col_widths']
+    row_h = layout['row_h']
+    border = max(1, round(2 * layout['scale']))
+    for block_idx in range(layout['blocks']):
+        block_x = layout['blocks_x'] + block_idx * (layout['block_w'] + d['block_margin'])
+        block_rows = page_rows[block_idx * layout['rows_per_block']:(block_idx + 1) * layout['rows_per_block']]
+        if not block_rows and block_idx > 0:
+            continue
+
+        y = d['table_top']
+        x = block_x
+        for col, width in zip(columns, col_widths):
+            draw_fitted(draw, (x + width / 2, y), col['header'], 'header', width - 4, d['header_size'], COLOR_TEXT_MAIN)
+            x += width
+        y += d['table_header_h'] * 0.6
+        draw.line((block_x, y, block_x + layout['block_w'], y), fill=COLOR_TEXT_MAIN, width=max(1, round(3 * layout['scale'])))
+        y += d['table_header_h'] * 0.4
+
+        for row in block_rows:
+            draw.rectangle([block_x, y, block_x + layout['block_w'], y + row_h], fill=COLOR_PAPER, outline=COLOR_TEXT_MAIN, width=border)
+            x = block_x
+            for col, width in zip(columns, col_widths):
+                size = row_h * (0.71 if col['role'] == 'nick' else 0.65)
+                draw_fitted(draw, (x + width / 2, y + row_h / 2), col['format'](row[col['key']]), col['role'], width - 8, size, COLOR_TEXT_MAIN)
+                x += width
+            y += layout['pitch']
+
+    if layout['rules_top'] is None:
+        return
+
+    # 규칙표 (캔버스 폭에 맞춰 칸 너비 조정)
+    rule_y = layout['rules_top']
+    draw.line((100 * layout['scale'], rule_y - 20 * layout['scale'], W - 100 * layout['scale'], rule_y - 20 * layout['scale']), fill=COLOR_TEXT_MAIN, width=max(2, round(5 * layout['scale'])))
+    draw_fitted(draw, (W / 2, rule_y + 20 * layout['scale']), "BOUNTY RULES", 'subtitle', W - 2 * d['margin'], d['sub_size'], COLOR_TEXT_MAIN)
+    rule_y += 60 * layout['scale']
+
+    unit = min(layout['scale'], (W - 2 * d['margin']) / (160 + 110 * 8))
+    header_w, val_w = 160 * unit, 110 * unit
+    rule_row_h = d['rule_row_h']
+    for r_data in rule_rows:
+        rx = (W - (header_w + val_w * 8)) / 2
+        for col_idx, cell_text in enumerate(r_data):
+            cell_w = header_w if col_idx == 0 else val_w
+            if cell_text:
+                draw.rectangle([rx, rule_y, rx + cell_w, rule_y + rule_row_h], fill=COLOR_BROWN_BAR, outline=COLOR_TEXT_MAIN, width=border)
+                is_header = (col_idx == 0 or col_idx % 2 != 0)
+                fill_c = COLOR_GOLD if is_header else COLOR_LIGHT_TEXT
+                max_size = d['rule_head_size'] if is_header else d['rule_val_size']
+                draw_fitted(draw, (rx + cell_w / 2, rule_y + rule_row_h / 2), cell_text, 'rule', cell_w - 6, max_size, fill_c)
+            rx += cell_w
+        rule_y += rule_row_h
+
+
+# --- [이미지 생성] 모든 페이지를 한 번에 렌더링 ---
+def render_poster_pages(df, month, fmt='classic', columns=POSTER_COLUMNS, rule_rows=BOUNTY_RULE_ROWS, bg_file=BG_IMAGE_FILE):
+    from PIL import ImageDraw
+
+    W, H = POSTER_FORMATS[fmt]['size']
+    ranked = rank_standings(df) if '순위' not in df.columns else df.reset_index(drop=True)
+    rows = ranked.to_dict('records')
+    layout = compute_layout(len(rows), (W, H), columns, show_rules=bool(rule_rows))
+
+    try:
+        background = load_background(W, H, bg_file)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"배경 이미지('{bg_file}')가 없습니다.")
+
+    pages = []
+    for page_idx in range(layout['pages']):
+        image = background.copy()
+        draw = ImageDraw.Draw(image)
+        title = f"ACE's PUB - {month}월 현상 수배자"
+        if layout['pages'] > 1:
+            title += f" ({page_idx + 1}/{layout['pages']})"
+        page_rows = rows[page_idx * layout['per_page']:(page_idx + 1) * layout['per_page']]
+        try:
+            _draw_page(draw, layout, page_rows, columns, title, rule_rows)
+        except OSError:
+            raise FileNotFoundError("글꼴 폴더의 폰트 파일을 찾을 수 없습니다.")
+        pages.append(image)
+    return pages
+
+
+# --- [파일] 한 장이면 PNG, 여러 장이면 PNG 묶음(ZIP) ---
+def poster_file(pages, month, fmt='classic'):
+    base_name = f"wanted_list_{month}" + ("" if fmt == 'classic' else f"_{fmt}")
+    if len(pages) == 1:
+        buf = io.BytesIO()
+        pages[0].save(buf, format="PNG")
+        return buf.getvalue(), f"{base_name}.png", "image/png"
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_STORED) as zf:
+        for idx, page in enumerate(pages, start=1):
+            page_buf = io.BytesIO()
+            page.save(page_buf, format="PNG")
+            zf.writestr(f"{base_name}_{idx}.png", page_buf.getvalue())
+    return buf.getvalue(), f"{base_name}.zip", "application/zip"
+
+
+def render_poster_file(df, month, fmt='classic', columns=POSTER_COLUMNS):
+    return poster_file(render_poster_pages(df, month, fmt, columns), month, fmt)
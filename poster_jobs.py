@@ -0,0 +1,40 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# --- [설정] 수배지 렌더링 작업 풀 ---
+POSTER_WORKERS = 2
+POSTER_KEEP = 8
+
+
+# --- [작업] 수배지 렌더링 (프로세스 공용 풀, 같은 요청은 하나로 합침) ---
+# 작업 핸들은 문자열 키다. 같은 순위표/형식으로 동시에 요청하면 같은 작업을 공유한다.
+class PosterJobs:
+    def __init__(self, max_workers=POSTER_WORKERS, keep=POSTER_KEEP):
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="poster")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._jobs.get(key)
+            # 실패한 작업은 다시 시도할 수 있게 새로 제출
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._executor.submit(fn, *args, **kwargs)
+                self._jobs[key] = future
+            self._jobs.move_to_end(key)
+            self._trim()
+            return key
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _trim(self):
+        # 끝난 작업만 오래된 순서로 정리 (진행 중인 작업은 남겨둔다)
+        for old_key in list(self._jobs):
+            if len(self._jobs) <= self.keep:
+                break
+            if self._jobs[old_key].done():
+                del self._jobs[old_key]
@@ -0,0 +1,121 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# --- [설정] 실력 레이팅 (다인전 Elo) ---
+RATING_BASE = 1500.0
+RATING_K = 32.0
+RATING_SCALE = 400.0
+
+
+# --- [함수] 경기 결과 -> 순위 목록 ---
+# 입상자는 등수(찹은 공동 1등), 리바인만 한 사람은 입상자 다음 등수로 본다.
+def game_places(winners, rebuy_names):
+    places = {}
+    for name, rank in winners:
+        place = 1 if isinstance(rank, str) else rank + 1
+        places[name] = min(place, places.get(name, place))
+    last = max(places.values(), default=0) + 1
+    for name in rebuy_names:
+        places.setdefault(name, last)
+    return [[name, place] for name, place in places.items()]
+
+
+def games_from_journal(records):
+    # 저널의 경기 입력 기록 (시간순)
+    for row in records:
+        game = row.get('m', {}).get('game')
+        if game and len(game['places']) >= 2:
+            yield row['q'], game['places']
+
+
+# --- [엔진] 경기마다 참가자 전원을 쌍으로 비교해 한 번에 갱신 ---
+class RatingEngine:
+    def __init__(self, base=RATING_BASE, k=RATING_K, scale=RATING_SCALE):
+        self.base = base
+        self.k = k
+        self.scale = scale
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.index = {}
+        self.names = []
+        self.ratings = np.full(64, self.base)
+        self.games = np.zeros(64, dtype=np.int64)
+        self.last_seq = 0
+        self.alias_key = None
+
+    def _ids(self, names):
+        for name in names:
+            if name not in self.index:
+                self.index[name] = len(self.names)
+                self.names.append(name)
+        if len(self.names) > len(self.ratings):
+            size = max(len(self.names), len(self.ratings) * 2)
+            self.ratings = np.concatenate([self.ratings, np.full(size - len(self.ratings), self.base)])
+            self.games = np.concatenate([self.games, np.zeros(size - len(self.games), dtype=np.int64)])
+        return np.fromiter((self.index[n] for n in names), dtype=np.int64, count=len(names))
+
+    @staticmethod
+    def _actual_scores(places):
+        # 각 참가자가 다른 참가자를 이긴 횟수 (동률은 0.5)
+        p = np.asarray(places, dtype=np.float64)
+        wins = (p[:, None] < p[None, :]).sum(axis=1)
+        ties = (p[:, None] == p[None, :]).sum(axis=1) - 1
+        return wins + 0.5 * ties
+
+    def _apply(self, ids, actual):
+        n = len(ids)
+        r = self.ratings[ids]
+        expected = 1.0 / (1.0 + 10.0 ** ((r[None, :] - r[:, None]) / self.scale))
+        # 대각선(자기 자신)은 0.5이므로 빼준다
+        expected_sum = expected.sum(axis=1) - 0.5
+        self.ratings[ids] = r + self.k / (n - 1) * (actual - expected_sum)
+        self.games[ids] += 1
+
+    def _merge(self, places, aliases):
+        merged = {}
+        for name, place in places:
+            name = aliases.get(name, name)
+            merged[name] = min(place, merged.get(name, place))
+        return list(merged.keys()), list(merged.values())
+
+    # --- 전체 재계산 / 증분 갱신 ---
+    def sync(self, records, aliases=None):
+        # 새 경기만 반영하고, 별칭(닉네임 합치기)이 바뀌었으면 처음부터 다시 계산
+        aliases = aliases or {}
+        alias_key = tuple(sorted(aliases.items()))
+        with self._lock:
+            if alias_key != self.alias_key:
+                self._reset()
+                self.alias_key = alias_key
+            # 저널은 순번 순서이므로 마지막으로 반영한 지점 이후만 훑는다
+            start = len(records)
+            while start > 0 and records[start - 1]['q'] > self.last_seq:
+                start -= 1
+            for seq, places in games_from_journal(records[start:]):
+                names, merged_places = self._merge(places, aliases)
+                if len(names) >= 2:
+                    self._apply(self._ids(names), self._actual_scores(merged_places))
+            if records:
+                self.last_seq = max(self.last_seq, records[-1]['q'])
+
+    def recompute(self, records, aliases=None):
+        with self._lock:
+            self.alias_key = None
+        self.sync(records, aliases)
+
+    def table(self):
+        with self._lock:
+            n = len(self.names)
+            return pd.DataFrame({
+                '닉네임': list(self.names),
+                '레이팅': self.ratings[:n].round(0),
+                '경기수': self.games[:n].copy(),
+            })
+
+    def attach(self, df):
+        # 순위표에 레이팅 컬럼 추가 (경기 기록이 없는 사람은 NaN)
+        return df.merge(self.table()[['닉네임', '레이팅']], on='닉네임', how='left')
@@ -0,0 +1,52 @@
+import pandas as pd
+
+# --- [로직] 점수 규칙 ---
+SCORE_RULES = {
+    "3 FREE": {"normal": [7, 5, 3], "2chop": 7, "3chop": 6, "4chop": 5, "rebuy": 0.5},
+    "5 FREE": {"normal": [10, 7, 5], "2chop": 10, "3chop": 9, "4chop": 8, "rebuy": 1.0}
+}
+
+
+# --- [로직] 리바인 명단 파싱 (예: "스틴 2, 에이스") ---
+def parse_rebuys(rebuy_text):
+    rebuys = []
+    for line in (rebuy_text or "").replace(',', '\n').split('\n'):
+        parts = line.strip().split()
+        if not parts: continue
+        try: count = int(parts[-1]); name = " ".join(parts[:-1])
+        except ValueError: count = 1; name = " ".join(parts)
+        if name: rebuys.append((name, count))
+    return rebuys
+
+
+# --- [로직] 경기 결과 -> 닉네임별 획득 점수 ---
+# winners: [(닉네임, 0/1/2 또는 '2chop'/'3chop'/'4chop'), ...]
+# 반환: (획득 점수, 입상자 [(닉네임, 등수)], 리바인 명단)
+def score_game(game_type, winners, rebuy_text, resolve=lambda name: name):
+    rule = SCORE_RULES[game_type]
+    updates = {}
+    placed, rebuyers = [], []
+    for name, rank in winners:
+        if name: name = resolve(str(name).strip())
+        if name:
+            pt = rule['normal'][rank] if isinstance(rank, int) else rule[rank]
+            updates[name] = updates.get(name, 0) + pt
+            placed.append((name, rank))
+    for name, count in parse_rebuys(rebuy_text):
+        name = resolve(name)
+        if name:
+            updates[name] = updates.get(name, 0) + (count * rule['rebuy'])
+            rebuyers.append(name)
+    return updates, placed, rebuyers
+
+
+def apply_updates(df, updates):
+    df = df.copy()
+    df['점수'] = df['점수'].astype(float)
+    for name, point in updates.items():
+        if name in df['닉네임'].values:
+            df.loc[df['닉네임'] == name, '점수'] += point
+        else:
+            new_row = pd.DataFrame({'닉네임': [name], '점수': [float(point)]})
+            df = pd.concat([df, new_row], ignore_index=True)
+    return df
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from standings import standings_version
+
+# --- [설정] 시트 감시 범위 (6행~26행, 1~20위 / 21~40위) ---
+RANKING_RANGES = ['A6:C26', 'D6:F26']
+
+
+# --- [함수] 시트 값 -> DataFrame ---
+def parse_ranking_ranges(ranges):
+    all_data = [row for block in ranges for row in block]
+    if not all_data:
+        return pd.DataFrame(columns=['닉네임', '점수'])
+
+    # 빈 칸이 있는 행은 3칸으로 맞춘 뒤 컬럼명 지정
+    all_data = [(list(row) + ['', '', ''])[:3] for row in all_data]
+    df = pd.DataFrame(all_data, columns=['순위', '닉네임', '점수'])
+    df = df[['닉네임', '점수']]
+    df['닉네임'] = df['닉네임'].astype(str).str.strip()
+    df['점수'] = pd.to_numeric(df['점수'], errors='coerce').fillna(0)
+
+    # 빈 값 제거
+    return df[df['닉네임'] != ""].reset_index(drop=True)
+
+
+def ranges_digest(ranges):
+    return hashlib.sha1(json.dumps(ranges, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+# --- [캐시] 프로세스 공용 순위표 ---
+# 모든 세션이 같은 DataFrame을 보고, 버전이 바뀐 세션만 새로고침한다.
+# 저장(시트 지우기 -> 왼쪽 쓰기 -> 오른쪽 쓰기)은 writing() 안에서 하고, 시트에서 읽은 값은
+# 읽기 시작할 때의 write_generation()을 함께 넘긴다. 읽는 도중 저장이 있었으면 그 값은 버린다.
+class StandingsCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._df = None
+        self._version = None
+        self._listeners = []
+        self._write_gen = 0
+        self._writes_in_flight = 0
+        self.updated_at = None
+
+    @property
+    def version(self):
+        return self._version
+
+    def get(self):
+        with self._lock:
+            if self._df is None:
+                return None, None
+            return self._df.copy(), self._version
+
+    def write_generation(self):
+        with self._lock:
+            return self._write_gen
+
+    @contextmanager
+    def writing(self):
+        with self._lock:
+            self._writes_in_flight += 1
+            self._write_gen += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._writes_in_flight -= 1
+                self._write_gen += 1
+
+    def set(self, df, version, source='sheet', meta=None, read_gen=None):
+        with self._lock:
+            # 시트에서 읽은 값인데 읽는 사이 저장이 시작/진행/완료됐으면 반쯤 쓰인 시트일 수 있다
+            if read_gen is not None and (self._writes_in_flight or read_gen != self._write_gen):
+                return False
+            if version == self._version:
+                return False
+            old_df = self._df
+            self._df = df.reset_index(drop=True).copy()
+            self._version = version
+            self.updated_at = time.time()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(old_df, df, version, source, meta)
+            except Exception:
+                pass
+        return True
+
+    def subscribe(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+
+
+# --- [감시] 시트 외부 수정 감지 스레드 (프로세스당 하나) ---
+class SheetWatcher(threading.Thread):
+    def __init__(self, fetch_ranges, cache, interval):
+        super().__init__(name="sheet-watcher", daemon=True)
+        self.fetch_ranges = fetch_ranges
+        self.cache = cache
+        self.interval = interval
+        self.last_digest = None
+        self.last_error = None
+        self._stop_event = threading.Event()
+
+    def poll_once(self):
+        read_gen = self.cache.write_generation()
+        ranges = self.fetch_ranges()
+        digest = ranges_digest(ranges)
+        if digest == self.last_digest:
+            return False
+        # 버전은 내용 기준이라, 우리가 저장한 값을 다시 읽어도 새로고침이 일어나지 않는다
+        df = parse_ranking_ranges(ranges)
+        changed = self.cache.set(df, standings_version(df), source='sheet', read_gen=read_gen)
+        if changed or self.cache.version == standings_version(df):
+            self.last_digest = digest
+        return changed
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll_once()
+                self.last_error = None
+            except Exception as e:
+                # 할당량 초과 등은 다음 주기에 다시 시도
+                self.last_error = e
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from sheet_watch import RANKING_RANGES, parse_ranking_ranges
+
+# --- [설정] 구글 시트 ---
+SHEET_NAME = 'Holdem_Ranking'
+SHEET_SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SECRETS_FILE = os.path.join(BASE_DIR, '.streamlit', 'secrets.toml')
+SQLITE_TABLE = 'standings'
+
+
+# --- [시간] 한국 시간 월 구하기 ---
+def get_current_month():
+    kst = timezone(timedelta(hours=9))
+    return datetime.now(kst).month
+
+
+# --- [함수] 구글 시트 연결 (Streamlit 없이도 사용) ---
+def sheet_client(creds_info):
+    import gspread
+    from google.oauth2.service_account import Credentials
+    creds = Credentials.from_service_account_info(dict(creds_info), scopes=SHEET_SCOPES)
+    return gspread.authorize(creds)
+
+
+def load_credentials(path=None):
+    # 서비스 계정 JSON 파일, 또는 secrets.toml의 [gcp_service_account]
+    path = path or SECRETS_FILE
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10 이하
+        import toml
+        return toml.load(path)['gcp_service_account']
+    with open(path, 'rb') as f:
+        return tomllib.load(f)['gcp_service_account']
+
+
+def load_sheet(client, month=None, sheet_name=SHEET_NAME):
+    # 앱은 첫 번째 시트에 이번 달 순위표만 기록하므로, 지난 달은 시트에서 읽을 수 없다
+    if month is not None and month != get_current_month():
+        raise ValueError(f"구글 시트에는 이번 달({get_current_month()}월) 순위표만 있습니다. "
+                         f"{month}월은 CSV/SQLite 장부를 소스로 지정하세요.")
+    return parse_ranking_ranges(client.open(sheet_name).sheet1.batch_get(RANKING_RANGES))
+
+
+# --- [함수] CSV / SQLite 장부 ---
+def _normalize(df, month):
+    if month is not None and '월' in df.columns:
+        df = df[pd.to_numeric(df['월'], errors='coerce') == month]
+    if '닉네임' not in df.columns or '점수' not in df.columns:
+        raise ValueError("장부에 '닉네임', '점수' 컬럼이 필요합니다.")
+    df = df[['닉네임', '점수']].copy()
+    df['닉네임'] = df['닉네임'].astype(str).str.strip()
+    df['점수'] = pd.to_numeric(df['점수'], errors='coerce').fillna(0)
+    df = df[df['닉네임'] != ""]
+    # 한 사람이 여러 줄이면 합산 (경기별 기록 CSV로도 순위를 다시 계산할 수 있게)
+    return df.groupby('닉네임', as_index=False, sort=False)['점수'].sum()
+
+
+def load_csv(path, month=None):
+    # 경로에 {month}가 있으면 달마다 다른 파일 (예: ledger_{month}.csv)
+    if '{month}' in path:
+        path = path.format(month=month)
+        month = None
+    return _normalize(pd.read_csv(path, encoding='utf-8-sig'), month)
+
+
+def load_sqlite(path, month=None, table=SQLITE_TABLE):
+    with sqlite3.connect(path) as conn:
+        df = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+    return _normalize(df, month)
+
+
+# --- [함수] 소스 문자열로 불러오기: sheet / sheet:<시트 이름> / *.csv / *.db ---
+def load_source(source, month=None, credentials=None):
+    if source == 'sheet' or source.startswith('sheet:'):
+        sheet_name = source.split(':', 1)[1] if ':' in source else SHEET_NAME
+        return load_sheet(sheet_client(load_credentials(credentials)), month, sheet_name)
+    if source.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+        return load_sqlite(source, month)
+    if source.lower().endswith('.csv'):
+        return load_csv(source, month)
+    raise ValueError(f"알 수 없는 데이터 소스: {source} (sheet, *.csv, *.db 중 하나)")
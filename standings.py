@@ -0,0 +1,91 @@
+import bisect
+import hashlib
+import threading
+
+import pandas as pd
+
+# --- [로직] 순위 계산 (동점자 처리: 1, 2, 2, 4...) ---
+def rank_standings(df):
+    df = df.copy()
+    df['점수'] = df['점수'].astype(float)
+    ranked = df.sort_values(by=['점수'], ascending=False, kind='mergesort').reset_index(drop=True)
+    ranked['순위'] = ranked['점수'].rank(method='min', ascending=False).astype(int)
+    return ranked
+
+
+# --- [로직] 순위표 버전 (내용이 같으면 같은 값) ---
+def standings_version(df):
+    digest = hashlib.sha1()
+    for name, score in sorted(zip(df['닉네임'].astype(str), df['점수'].astype(float))):
+        digest.update(f"{name}\t{score:.4f}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+# --- [로직] 순위 변동 (직전 저장 대비 ▲/▼/NEW) ---
+# 점수를 내림차순 정렬 리스트로 들고 있다가, 저장마다 바뀐 사람만 빼고 넣는다.
+# 순위 = (나보다 점수가 높은 사람 수) + 1 이므로 이분 탐색 한 번으로 구한다.
+class RankTracker:
+    def __init__(self, current=None, changes=()):
+        current = dict(current or {})
+        previous = dict(current)
+        _revert(previous, changes)
+        self.scores = current
+        self.prev_scores = previous
+        self._sorted = sorted(-s for s in current.values())
+        self._prev_sorted = sorted(-s for s in previous.values())
+        self._last_changes = list(changes)
+        self._lock = threading.Lock()
+
+    def commit(self, changes):
+        with self._lock:
+            # 직전 스냅샷은 지난번 변경분만 반영해 한 칸 앞으로, 현재는 이번 변경분만 반영
+            _apply_sorted(self.prev_scores, self._prev_sorted, self._last_changes)
+            _apply_sorted(self.scores, self._sorted, changes)
+            self._last_changes = list(changes)
+
+    def on_record(self, row):
+        self.commit(row['d'])
+
+    def movement(self, name):
+        with self._lock:
+            if name not in self.scores:
+                return None
+            if name not in self.prev_scores:
+                return 'NEW'
+            prev_rank = bisect.bisect_left(self._prev_sorted, -self.prev_scores[name]) + 1
+            rank = bisect.bisect_left(self._sorted, -self.scores[name]) + 1
+            return prev_rank - rank
+
+    def attach(self, df):
+        df = df.copy()
+        # int와 None이 섞이면 pandas가 float로 바꿔 '▲2.0'이 되므로 object로 유지
+        df['변동'] = pd.Series([self.movement(str(name)) for name in df['닉네임']], index=df.index, dtype=object)
+        return df
+
+
+def format_movement(move):
+    if move == 'NEW':
+        return "NEW"
+    if not move or move != move:
+        return "-"
+    move = int(move)
+    return f"▲{move}" if move > 0 else f"▼{-move}"
+
+
+def _revert(scores, changes):
+    for name, before, _ in changes:
+        if before is None:
+            scores.pop(name, None)
+        else:
+            scores[name] = before
+
+
+def _apply_sorted(scores, ordered, changes):
+    for name, _, after in changes:
+        if name in scores:
+            del ordered[bisect.bisect_left(ordered, -scores[name])]
+        if after is None:
+            scores.pop(name, None)
+        else:
+            scores[name] = after
+            bisect.insort(ordered, -after)
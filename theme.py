@@ -0,0 +1,13 @@
+import os
+
+# --- [설정] 배경 이미지 (실행 위치와 상관없이 이 폴더 기준) ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BG_IMAGE_FILE = os.path.join(BASE_DIR, 'bounty_bg.png')
+
+# --- [설정] 디자인 컬러 팔레트 (웹 화면 / 수배지 공용) ---
+COLOR_TEXT_MAIN = "#3E2723"
+COLOR_RED = "#B71C1C"
+COLOR_GOLD = "#FFD700"
+COLOR_BROWN_BAR = "#8D6E63"
+COLOR_LIGHT_TEXT = "#EFEBE9"
+COLOR_PAPER = "#FFF8E1"
@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+import time
+
+from standings import rank_standings
+
+# --- [설정] TV 화면용 변경분 피드 (정적 파일로 서빙) ---
+# 실행 위치와 상관없이 <앱 폴더>/static, <앱 폴더>/templates 를 쓴다
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TV_FEED_DIR = os.path.join(BASE_DIR, 'static', 'tv')
+TV_FEED_URL = 'app/static/tv'
+TV_TEMPLATE_FILE = os.path.join(BASE_DIR, 'templates', 'tv_board.html')
+FEED_KEEP = 30
+
+
+def _write_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def ranked_rows(df):
+    if df is None or df.empty:
+        return {}
+    ranked = rank_standings(df)
+    return {name: (int(rank), round(float(score), 1))
+            for name, rank, score in zip(ranked['닉네임'], ranked['순위'], ranked['점수'])}
+
+
+# --- [피드] 순위표가 바뀔 때마다 바뀐 행만 기록 ---
+# feed.json        : {epoch, seq, max}만 담은 작은 머리 파일 (TV가 몇 초마다 확인)
+# delta-<seq>.json : 저장 한 번의 변경분 (TV는 seq가 올라갔을 때만 받는다)
+# snapshot.json    : 전체 순위표 (TV가 처음 열리거나 변경분을 놓쳤을 때만)
+# Streamlit 정적 파일 서빙은 ETag/304를 지원하지 않아서, 매번 받는 파일은 작게 유지한다.
+class TvFeed:
+    def __init__(self, out_dir=TV_FEED_DIR, keep=FEED_KEEP):
+        self.out_dir = out_dir
+        self.keep = keep
+        self.epoch = int(time.time())
+        self.seq = 0
+        self.rows = {}
+        self._lock = threading.Lock()
+        os.makedirs(out_dir, exist_ok=True)
+        # 이전 실행의 변경분 파일은 epoch가 달라 쓸모없으므로 정리
+        for name in os.listdir(out_dir):
+            if name.startswith('delta-'):
+                os.remove(os.path.join(out_dir, name))
+
+    def publish(self, old_df, new_df, version, source, meta=None):
+        new_rows = ranked_rows(new_df)
+        with self._lock:
+            changed = [
+                {'n': name, 'r': rank, 's': score, 'p': self.rows[name][0] if name in self.rows else None}
+                for name, (rank, score) in new_rows.items()
+                if self.rows.get(name) != (rank, score)
+            ]
+            removed = [name for name in self.rows if name not in new_rows]
+            if not changed and not removed and self.seq > 0:
+                return
+            self.seq += 1
+            self.rows = new_rows
+            self._write({'q': self.seq, 'rows': changed, 'removed': removed})
+
+    def _write(self, delta):
+        max_score = max((score for _, score in self.rows.values()), default=0)
+        # 변경분 -> 전체 -> 머리 순서로 써야 TV가 머리를 보고 받으러 왔을 때 파일이 있다
+        _write_json(os.path.join(self.out_dir, f"delta-{delta['q']}.json"), delta)
+        _write_json(os.path.join(self.out_dir, 'snapshot.json'), {
+            'epoch': self.epoch, 'seq': self.seq, 'max': max_score,
+            'rows': [{'n': name, 'r': rank, 's': score} for name, (rank, score) in self.rows.items()],
+        })
+        _write_json(os.path.join(self.out_dir, 'feed.json'), {'epoch': self.epoch, 'seq': self.seq, 'max': max_score})
+        stale = os.path.join(self.out_dir, f"delta-{delta['q'] - self.keep}.json")
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def render_tv_html(template, rows_per_page, rotate_sec, poll_sec):
+    return (template
+            .replace('__FEED_URL__', TV_FEED_URL)
+            .replace('__FEED_KEEP__', str(FEED_KEEP))
+            .replace('__ROWS_PER_PAGE__', str(rows_per_page))
+            .replace('__ROTATE_MS__', str(int(rotate_sec * 1000)))
+            .replace('__POLL_MS__', str(int(poll_sec * 1000))))
@@ -0,0 +1,176 @@
+# ACE's Wanted List 명령줄 도구 (Streamlit 없이 실행)
+#   python wanted_cli.py standings --source ledger.csv --month 3
+#   python wanted_cli.py render --source ledger.csv --months 1-3 --poster classic,story --export xlsx --out-dir out --jobs 3
+# 소스: sheet (구글 시트, 이번 달만, .streamlit/secrets.toml 또는 --credentials JSON), sheet:<시트 이름>, *.csv, *.db(SQLite)
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+def parse_months(text):
+    # "1-3,5" -> [1, 2, 3, 5]
+    months = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, end = (int(x) for x in part.split('-', 1))
+                if start > end:
+                    raise argparse.ArgumentTypeError(f"범위가 거꾸로입니다: {part} ({end}-{start}로 입력하세요)")
+                months.extend(range(start, end + 1))
+            else:
+                months.append(int(part))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"월 형식이 잘못되었습니다: {part}")
+    if not months:
+        raise argparse.ArgumentTypeError("월을 하나 이상 입력하세요.")
+    if any(m < 1 or m > 12 for m in months):
+        raise argparse.ArgumentTypeError(f"월은 1~12 사이여야 합니다: {text}")
+    return sorted(set(months))
+
+
+def parse_list(text):
+    return [item.strip() for item in text.split(',') if item.strip()] if text else []
+
+
+# --- [명령] standings: 순위표 계산/출력 ---
+def cmd_standings(args):
+    from exporter import EXPORT_FORMATS, export_to_path
+    from sources import get_current_month, load_source
+    from standings import rank_standings
+
+    # 파일을 만들기 전에 형식부터 확인한다 (render와 같은 메시지)
+    fmt = os.path.splitext(args.out)[1].lstrip('.').lower() if args.out else None
+    if fmt is not None and fmt not in EXPORT_FORMATS:
+        print(f"⚠️ 알 수 없는 형식: {fmt or '(확장자 없음)'} ({' / '.join(EXPORT_FORMATS)})", file=sys.stderr)
+        return 2
+
+    month = args.month or get_current_month()
+    ranked = rank_standings(load_source(args.source, month, args.credentials))
+    if args.top:
+        ranked = ranked.head(args.top)
+    if args.out:
+        export_to_path(ranked, fmt, args.out)
+        print(f"💾 {args.out} ({len(ranked)}명)")
+        return 0
+    for row in ranked.itertuples(index=False):
+        print(f"{row.순위:>4}  {row.닉네임:<16}  ${row.점수:.1f}")
+    return 0
+
+
+# --- [명령] render: 달마다 수배지/장부 파일 만들기 (프로세스 병렬) ---
+def render_month(job):
+    from exporter import export_filename, export_to_path
+    from poster import render_poster_file
+    from sources import load_source
+    from standings import rank_standings
+
+    month = job['month']
+    ranked = rank_standings(load_source(job['source'], month, job['credentials']))
+    written = []
+    for fmt in job['posters']:
+        data, filename, _ = render_poster_file(ranked, month, fmt)
+        path = os.path.join(job['out_dir'], filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+        written.append(path)
+    for fmt in job['exports']:
+        written.append(export_to_path(ranked, fmt, os.path.join(job['out_dir'], export_filename(fmt, [month]))))
+    return month, len(ranked), written
+
+
+def cmd_render(args):
+    from exporter import EXPORT_FORMATS
+    from poster import POSTER_FORMATS
+    from sources import get_current_month
+
+    posters = parse_list(args.poster)
+    exports = parse_list(args.export)
+    unknown = [p for p in posters if p not in POSTER_FORMATS] + [e for e in exports if e not in EXPORT_FORMATS]
+    if unknown:
+        print(f"⚠️ 알 수 없는 형식: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    months = args.months or [get_current_month()]
+    os.makedirs(args.out_dir, exist_ok=True)
+    jobs = [{'month': m, 'source': args.source, 'credentials': args.credentials,
+             'posters': posters, 'exports': exports, 'out_dir': args.out_dir} for m in months]
+
+    failed = 0
+    workers = min(args.jobs, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(job['month'], pool.submit(render_month, job)) for job in jobs]
+            results = []
+            for month, future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    failed += 1
+                    print(f"⚠️ {month}월 실패: {e}", file=sys.stderr)
+    else:
+        results = []
+        for job in jobs:
+            try:
+                results.append(render_month(job))
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ {job['month']}월 실패: {e}", file=sys.stderr)
+
+    for month, count, written in results:
+        print(f"📜 {month}월 ({count}명)")
+        for path in written:
+            print(f"   - {path}")
+
+    if args.combined and exports:
+        # 여러 달 장부를 한 파일로 (청크 단위로 스트리밍)
+        from exporter import export_filename, export_to_path
+        from sources import load_source
+        from standings import rank_standings
+        frames = {m: rank_standings(load_source(args.source, m, args.credentials)) for m in months}
+        for fmt in exports:
+            path = export_to_path(frames, fmt, os.path.join(args.out_dir, export_filename(fmt, months)))
+            print(f"📂 {path}")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="wanted_cli", description="ACE's Wanted List 명령줄 도구")
+    sub = parser.add_subparsers(dest='command', required=True)
+    # 공통 옵션은 하위 명령 뒤에 쓴다 (예: render --source sheet --credentials key.json)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--credentials', help="서비스 계정 JSON 또는 secrets.toml 경로 (sheet 소스용)")
+
+    p_standings = sub.add_parser('standings', parents=[common], help="순위표 계산/출력")
+    p_standings.add_argument('--source', required=True, help="sheet, sheet:<이름>, *.csv, *.db")
+    p_standings.add_argument('--month', type=int, help="기본: 이번 달")
+    p_standings.add_argument('--top', type=int, default=0, help="상위 N명만 (기본: 전체)")
+    p_standings.add_argument('--out', help="파일로 저장 (.csv / .xlsx / .parquet)")
+    p_standings.set_defaults(func=cmd_standings)
+
+    p_render = sub.add_parser('render', parents=[common], help="수배지/장부 파일 일괄 생성")
+    p_render.add_argument('--source', required=True, help="sheet(이번 달만), sheet:<이름>, *.csv, *.db (CSV는 ledger_{month}.csv 형태도 가능)")
+    p_render.add_argument('--months', type=parse_months, help="예: 3 또는 1-3,5 (기본: 이번 달)")
+    p_render.add_argument('--poster', default='classic', help="수배지 형식 (classic,story,square / 빈 값이면 생략)")
+    p_render.add_argument('--export', default='', help="장부 형식 (csv,xlsx,parquet)")
+    p_render.add_argument('--combined', action='store_true', help="여러 달 장부를 한 파일로도 저장")
+    p_render.add_argument('--out-dir', default='out')
+    p_render.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="동시에 처리할 달 수 (프로세스)")
+    p_render.set_defaults(func=cmd_render)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())